@@ -1 +1,9 @@
-from .comp import cmp_titles
\ No newline at end of file
+from .comp import cmp_titles, prepare_title
+from .helpers import PreparedTitle
+from .linking import link_datasets, evaluate_blocking, BlockIndex
+from .matrix import cmp_titles_matrix
+from .parallel import link_datasets_parallel
+from .index import TitleIndex
+from .rules import Rule, rule, RuleEngine
+from .cluster import cluster_titles
+from .resolver import TitleResolver
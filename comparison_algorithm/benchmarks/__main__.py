@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite of the comparison algorithm on a synthetic corpus.
+
+$ python -m comparison_algorithm.benchmarks --pairs 20000 --output results.json
+$ python -m comparison_algorithm.benchmarks --compare results.json
+"""
+
+import json
+import platform
+import click
+from time import perf_counter
+from ..comp import cmp_titles, prepare_title, _pre_processing
+from ..helpers import std, extract_all_numbers
+from ..rules import numbering_rule, first_letter_rule
+from .corpus import generate_pairs
+
+
+PERCENTILES = [50, 90, 99]
+
+
+def _percentile(sorted_values, p):
+    """ returns the :p: percentile of :sorted_values: (nearest rank) """
+    index = max(0, int(round(p / 100 * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+def measure(func, args_list, repeat=1, unit="pairs"):
+    """
+    calls :func: for all argument tuples in :args_list: :repeat: times
+    and returns calls (:unit:) per second and latency percentiles (in microseconds)
+    """
+    timings = []
+    total = 0.0
+    for _ in range(repeat):
+        for args in args_list:
+            start = perf_counter()
+            func(*args)
+            elapsed = perf_counter() - start
+            timings.append(elapsed)
+            total += elapsed
+    timings.sort()
+    result = {
+        "unit": unit,
+        "calls": len(timings),
+        "per_second": len(timings) / total if total else float("inf"),
+    }
+    for p in PERCENTILES:
+        result["p{0}_us".format(p)] = _percentile(timings, p) * 1e6
+    result["max_us"] = timings[-1] * 1e6
+    return result
+
+
+def run(n_pairs=10000, seed=0, repeat=1):
+    """
+    runs all benchmarks on :n_pairs: synthetic title pairs and returns the results
+    """
+    pairs = generate_pairs(n_pairs, seed)
+    titles = [ (t,) for pair in pairs for t in pair ]
+    pre_pairs = [ (_pre_processing(a), _pre_processing(b)) for a, b in pairs ]
+    pre_titles = [ (t,) for pair in pre_pairs for t in pair ]
+
+    results = {}
+    prepare_title.cache_clear()
+    results["cmp_titles (cold cache)"] = measure(lambda a, b: cmp_titles([a], [b]), pairs)
+    results["cmp_titles"] = measure(lambda a, b: cmp_titles([a], [b]), pairs, repeat)
+    results["cmp_titles (score_cutoff=0.85)"] = measure(
+        lambda a, b: cmp_titles([a], [b], score_cutoff=0.85), pairs, repeat)
+    results["_pre_processing"] = measure(_pre_processing, titles, repeat, "titles")
+    results["std"] = measure(std, pre_titles, repeat, "titles")
+    results["extract_all_numbers"] = measure(extract_all_numbers, pre_titles, repeat, "titles")
+    results["numbering_rule"] = measure(numbering_rule, pre_pairs, repeat)
+    results["first_letter_rule"] = measure(first_letter_rule, pre_pairs, repeat)
+
+    return {
+        "corpus": {"pairs": n_pairs, "seed": seed},
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results
+    }
+
+
+def print_results(report, baseline=None):
+    header = "{0:<32}{1:>20}{2:>10}{3:>10}{4:>10}".format("benchmark", "per second", "p50 us", "p90 us", "p99 us")
+    if baseline:
+        header += "{0:>10}".format("speedup")
+    print(header)
+    for name, r in report["results"].items():
+        line = "{0:<32}{1:>13.0f} {2:<6}{3:>10.2f}{4:>10.2f}{5:>10.2f}".format(
+            name, r["per_second"], r["unit"], r["p50_us"], r["p90_us"], r["p99_us"])
+        if baseline and name in baseline["results"]:
+            line += "{0:>9.2f}x".format(r["per_second"] / baseline["results"][name]["per_second"])
+        print(line)
+
+
+@click.command()
+@click.option("--pairs", "-n", default=10000, show_default=True, help="number of synthetic title pairs")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--repeat", "-r", default=3, show_default=True)
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="write results as JSON")
+@click.option("--compare", "-c", type=click.Path(exists=True, dir_okay=False), help="JSON results of a previous run")
+def main(pairs, seed, repeat, output, compare):
+    report = run(pairs, seed, repeat)
+    baseline = None
+    if compare:
+        with open(compare) as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Reproducible synthetic corpus of game-like titles for benchmarks.
+Titles contain roman and arabic numerals, years, series prefixes from
+series.txt, trademark symbols and Japanese macrons.
+"""
+
+import random
+import roman
+from ..helpers import load_series
+
+
+WORDS = [
+    "Final", "Fantasy", "Dragon", "Quest", "Resident", "Evil", "Legend", "Zelda",
+    "Star", "Ocean", "Mario", "Party", "Kart", "Super", "Street", "Fighter", "Metal",
+    "Gear", "Solid", "Silent", "Hill", "Tales", "Sonic", "Hedgehog", "Soccer",
+    "Racing", "Tennis", "Golf", "Pro", "Wrestling", "Adventure", "Island", "Kingdom",
+    "Heroes", "Wars", "Chronicles", "Saga", "Battle", "Arena", "World", "Mahjong",
+    "Shogi", "Puzzle", "Ninja", "Samurai", "Dark", "Souls", "Witcher", "Wild", "Hunt",
+]
+
+MACRON_WORDS = ["Ōkami", "Yūsha", "Shōgun", "Tōkyō", "Kyūkyoku", "Jūdō", "Ōendan"]
+ARTICLES = ["The", "THE", "the"]
+TRADEMARKS = ["™", "®", "(TM)", "(R)"]
+SUBTITLE_SEPARATORS = [": ", " - ", " "]
+
+
+def _numeral(rnd):
+    """ returns a random arabic numeral, roman numeral or year """
+    kind = rnd.random()
+    if kind < 0.4:
+        return str(rnd.randint(1, 12))
+    elif kind < 0.7:
+        return roman.toRoman(rnd.randint(1, 12))
+    elif kind < 0.9:
+        return str(rnd.randint(1985, 2019))
+    else:
+        return "'{0:02d}".format(rnd.randint(0, 19))
+
+
+def _words(rnd, n):
+    words = [ rnd.choice(WORDS) for _ in range(n) ]
+    if rnd.random() < 0.1:
+        words[rnd.randrange(n)] = rnd.choice(MACRON_WORDS)
+    return " ".join(words)
+
+
+def generate_title(rnd, series=None):
+    """
+    returns a random game-like title, using random number generator :rnd:
+    and list of :series: prefixes
+    """
+    title = _words(rnd, rnd.randint(1, 3))
+    if rnd.random() < 0.2:
+        title = rnd.choice(ARTICLES) + " " + title
+    if rnd.random() < 0.5:
+        title += " " + _numeral(rnd)
+    if rnd.random() < 0.3:
+        title += rnd.choice(SUBTITLE_SEPARATORS) + _words(rnd, rnd.randint(1, 3))
+    if series and rnd.random() < 0.05:
+        title = rnd.choice(series) + " Series " + title
+    if rnd.random() < 0.05:
+        title += rnd.choice(TRADEMARKS)
+    if rnd.random() < 0.05:
+        title += " (" + _numeral(rnd) + ")"
+    return title
+
+
+def _to_roman(match_str):
+    return roman.toRoman(int(match_str)) if 0 < int(match_str) < 40 else match_str
+
+
+def generate_variant(rnd, title):
+    """
+    returns a spelling variant of :title: (numeral style, case, punctuation, typo)
+    """
+    words = title.split(" ")
+    for i, word in enumerate(words):
+        if word.isdigit() and rnd.random() < 0.5:
+            words[i] = _to_roman(word)
+    variant = " ".join(words)
+
+    kind = rnd.random()
+    if kind < 0.25:
+        variant = variant.upper()
+    elif kind < 0.5:
+        variant = variant.replace(": ", " ").replace(" - ", ": ")
+    elif kind < 0.75 and len(variant) > 3:
+        pos = rnd.randrange(len(variant))
+        variant = variant[:pos] + rnd.choice("aeiou") + variant[pos+1:]
+    return variant
+
+
+def generate_titles(n, seed=0):
+    """
+    returns a list of :n: synthetic titles, reproducible for the same :seed:
+    """
+    rnd = random.Random(seed)
+    series = load_series()
+    return [ generate_title(rnd, series) for _ in range(n) ]
+
+
+def generate_pairs(n, seed=0, variant_ratio=0.5):
+    """
+    returns a list of :n: title pairs, reproducible for the same :seed:.
+    :variant_ratio: of the pairs are spelling variants of the same title, the others are random.
+    """
+    rnd = random.Random(seed)
+    series = load_series()
+    pairs = []
+    for _ in range(n):
+        a = generate_title(rnd, series)
+        if rnd.random() < variant_ratio:
+            b = generate_variant(rnd, a)
+        else:
+            b = generate_title(rnd, series)
+        pairs.append((a, b))
+    return pairs
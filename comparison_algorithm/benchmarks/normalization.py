@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the normalization functions (_pre_processing, std)
+against their former chained str.replace implementation.
+
+$ python -m comparison_algorithm.benchmarks.normalization named_entity_recognition/dict/game_titles.json
+"""
+
+import json
+import click
+from timeit import default_timer as timer
+from ..comp import _pre_processing, REMOVE_SERIES
+from ..helpers import std, remove_tm, PUNCT_TRANSTABLE
+
+
+TITLE_LIST = "named_entity_recognition/dict/game_titles.json"
+
+
+#REFERENCE IMPLEMENTATION
+def std_chained(a):
+    if a:
+        a = a.replace("The"," "). replace("・", " ").replace("THE", " ").replace("the", " ")
+        a = a.translate(PUNCT_TRANSTABLE)
+        a = a.replace("ō", "o").replace("Ō", "O").replace("ū", "u").replace("Ū", "U")
+        a = a.replace("ou", "o").replace("Ou", "O").replace("uu", "u").replace("Uu", "U").replace("nb", "mb")
+        a = a.lower()
+        return a
+    else:
+        return ""
+
+def pre_processing_chained(a):
+    if a:
+        a = remove_tm(a)
+        a = a.replace("Ⅱ", "II")
+        a = a.split("(")[0]
+        a = a.replace("〔", "").replace("〕","")
+
+        for series in REMOVE_SERIES:
+            if series in a:
+                a = a.replace(series+" Series","")
+                break
+    return a.strip()
+
+
+def _time(func, titles, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = timer()
+        for title in titles:
+            func(title)
+        best = min(best, timer() - start)
+    return best
+
+
+def compare(titles, repeat=3):
+    """
+    checks that the current and the chained implementations produce identical output for :titles:
+    and returns the best runtimes in seconds
+    """
+    results = {}
+    for name, current, chained in [
+            ("_pre_processing", _pre_processing, pre_processing_chained),
+            ("std", std, std_chained)]:
+        mismatches = [ t for t in titles if current(t) != chained(t) ]
+        if mismatches:
+            raise AssertionError("{0} differs for {1!r}".format(name, mismatches[:10]))
+        results[name] = {
+            "current": _time(current, titles, repeat),
+            "chained": _time(chained, titles, repeat)
+        }
+    return results
+
+
+@click.command()
+@click.argument("title_list", default=TITLE_LIST)
+@click.option("--repeat", "-r", default=3)
+def main(title_list, repeat):
+    with open(title_list) as f:
+        titles = [ t for t in json.load(f) if t ]
+    print("{0} titles".format(len(titles)))
+    for name, times in compare(titles, repeat).items():
+        print("{0}:\t chained {1:.3f}s, current {2:.3f}s ({3:.2f}x)".format(
+            name, times["chained"], times["current"], times["chained"]/times["current"]))
+
+
+if __name__ == "__main__":
+    main()
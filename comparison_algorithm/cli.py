@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+command line interface of the comparison algorithm
+
+$ python -m comparison_algorithm link records_a.jsonl records_b.jsonl matches.jsonl
+"""
+
+import json
+import os
+import click
+from tqdm import tqdm
+from itertools import islice
+from .parallel import link_chunks
+from .corpus import load_corpus
+from .server import ComparisonServer
+from .config import *
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+CHECKPOINT_EXT = ".checkpoint"
+
+
+def read_records(filepath):
+    """
+    Streams (id, titles) records from a JSON Lines file of {"id": ..., "titles": [...]} objects
+    """
+    with open(filepath) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["id"], record["titles"]
+
+
+def load_checkpoint(filepath):
+    """
+    Loads checkpoint file :filepath:, returns None if it does not exist
+    """
+    if not os.path.isfile(filepath):
+        return None
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def save_checkpoint(filepath, checkpoint):
+    """
+    Atomically replaces checkpoint file :filepath:
+    """
+    tmp_filepath = filepath + ".tmp"
+    with open(tmp_filepath, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_filepath, filepath)
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.argument("records_a", type=click.Path(exists=True, dir_okay=False))
+@click.argument("records_b", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.option("--threshold", "-t", default=LINK_THRESHOLD, show_default=True)
+@click.option("--jobs", "-j", default=1, show_default=True, help="number of worker processes (0: number of CPUs)")
+@click.option("--chunk-size", default=CHUNK_SIZE, show_default=True)
+@click.option("--checkpoint", type=click.Path(dir_okay=False), help="checkpoint file (default: OUTPUT.checkpoint)")
+@click.option("--progress/--no-progress", default=True)
+def link(records_a, records_b, output, threshold, jobs, chunk_size, checkpoint, progress):
+    """
+    Links the records of RECORDS_A against RECORDS_B (JSON Lines files of {"id", "titles"} records)
+    and writes the matches as JSON Lines to OUTPUT. A killed run is resumed from its checkpoint.
+    """
+    checkpoint = checkpoint or output + CHECKPOINT_EXT
+    arguments = {
+        "records_a": os.path.abspath(records_a),
+        "records_b": os.path.abspath(records_b),
+        "threshold": threshold
+    }
+
+    state = load_checkpoint(checkpoint)
+    if state is None:
+        state = dict(arguments, records=0, output_bytes=0)
+        if os.path.exists(output):
+            os.truncate(output, 0)
+    elif any(state[k] != v for k, v in arguments.items()):
+        raise click.ClickException("checkpoint {0} was written for different arguments".format(checkpoint))
+    elif os.path.exists(output):
+        #drop matches written after the last checkpoint
+        os.truncate(output, state["output_bytes"])
+        click.echo("resuming after {0} records".format(state["records"]), err=True)
+
+    records = islice(read_records(records_a), state["records"], None)
+    chunks = link_chunks(records, read_records(records_b), threshold,
+                         jobs=jobs or None, chunk_size=chunk_size)
+
+    with open(output, "ab") as f, \
+         tqdm(initial=state["records"], unit=" records", disable=not progress) as pbar:
+        for n_records, matches in chunks:
+            for id_a, id_b, score in matches:
+                line = json.dumps({"id_a": id_a, "id_b": id_b, "score": score}, ensure_ascii=False)
+                f.write(line.encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+            state["records"] += n_records
+            state["output_bytes"] = f.tell()
+            save_checkpoint(checkpoint, state)
+            pbar.update(n_records)
+
+    os.remove(checkpoint)
+
+
+@cli.command("build-corpus")
+@click.argument("title_list", type=click.Path(exists=True, dir_okay=False))
+@click.argument("corpus", type=click.Path(dir_okay=False))
+def build_corpus(title_list, corpus):
+    """
+    Builds the memory-mappable CORPUS file for TITLE_LIST (JSON list of titles),
+    if it does not exist or is stale.
+    """
+    with load_corpus(corpus, title_list) as title_corpus:
+        click.echo("{0} titles in {1}".format(len(title_corpus), corpus))
+
+
+@cli.command()
+@click.option("--socket", "socket_path", type=click.Path(dir_okay=False), help="listen on Unix socket")
+@click.option("--host", default=SERVER_HOST, show_default=True)
+@click.option("--port", default=SERVER_PORT, show_default=True)
+@click.option("--titles", type=click.Path(exists=True, dir_okay=False), help="JSON title list for lookups")
+@click.option("--corpus", type=click.Path(dir_okay=False), help="corpus file of the title list")
+@click.option("--jobs", "-j", default=1, show_default=True, help="number of worker processes")
+@click.option("--max-batch-size", default=SERVER_MAX_BATCH_SIZE, show_default=True)
+@click.option("--max-wait", default=SERVER_MAX_WAIT, show_default=True, help="seconds to wait for a batch to fill")
+def serve(socket_path, host, port, titles, corpus, jobs, max_batch_size, max_wait):
+    """
+    Runs the comparison server (JSON Lines requests, see server module).
+    """
+    server = ComparisonServer(titles, corpus, jobs, max_batch_size, max_wait)
+    click.echo("listening on {0}".format(socket_path or "{0}:{1}".format(host, port)), err=True)
+    server.serve_forever(socket_path, host, port)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+cluster module groups near-duplicate titles of a single title list
+"""
+
+from .comp import cmp_titles, ALL_RULES
+from .linking import BlockIndex
+from .config import *
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+class UnionFind(object):
+    """
+    disjoint sets of the integers 0..n-1 (union by size, path compression)
+    """
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x):
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, x, y):
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return
+        if self.size[x] < self.size[y]:
+            x, y = y, x
+        self.parent[y] = x
+        self.size[x] += self.size[y]
+
+
+def cluster_titles(titles, threshold=LINK_THRESHOLD, rules=ALL_RULES, **index_args):
+    """
+    Groups variant spellings in list of :titles:. Candidate pairs come from the
+    blocking index, pairs with a cmp_titles score >= :threshold: are merged
+    (transitively). Returns the cluster of every title as the index of the
+    cluster's first title.
+    """
+    index = BlockIndex(( (i, [title]) for i, title in enumerate(titles) ), **index_args)
+    clusters = UnionFind(len(index))
+
+    for i in range(len(index)):
+        for j in index.candidates(index.titles[i]):
+            if j <= i or clusters.find(i) == clusters.find(j):
+                continue
+            if cmp_titles(index.titles[i], index.titles[j], rules=rules, score_cutoff=threshold) >= threshold:
+                clusters.union(i, j)
+
+    first = {}
+    return [ first.setdefault(clusters.find(i), i) for i in range(len(index)) ]
+
+
+def group_clusters(titles, labels):
+    """
+    returns the lists of titles per cluster (clusters with more than one title only)
+    """
+    groups = {}
+    for title, label in zip(titles, labels):
+        groups.setdefault(label, []).append(title)
+    return [ group for group in groups.values() if len(group) > 1 ]
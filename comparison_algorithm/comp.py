@@ -4,10 +4,14 @@ link module for linking datasets
 """
 
 from itertools import product
+from functools import lru_cache
+from time import perf_counter
 import random
 import Levenshtein as lev
+from . import instrumentation
 from .rules import *
-from .helpers import remove_tm, std, load_series, remove_numbers
+from .helpers import load_series, compile_alternation, PreparedTitle
+from .helpers import _roman_value
 from .config import *
 
 __author__ = "Florian Rämisch and Peter Mühleder"
@@ -20,44 +24,108 @@ ALL_RULES = [first_letter_rule, numbering_rule]
 
 #PREPROCESSING
 REMOVE_SERIES = load_series()
+REMOVE_SERIES_RE = compile_alternation(REMOVE_SERIES)
 
 def _pre_processing(a):
     """
     inital steps of preparing string :a: for matching
     """
     if a:
-        a = remove_tm(a)
-        a = a.replace("Ⅱ", "II")
-        a = a.split("(")[0]
-        a = a.replace("〔", "").replace("〕","")
-
-        for series in REMOVE_SERIES:
-            if series in a:
-                a = a.replace(series+" Series","")
-                break
+        a = a.replace("™", "").replace("®", "")
+        if "(" in a:
+            a = a.replace("(TM)", "").replace("(R)", "").split("(")[0]
+        a = a.replace("Ⅱ", "II").replace("〔", "").replace("〕","")
+
+        #only the first series found in REMOVE_SERIES is removed
+        if REMOVE_SERIES_RE.search(a):
+            for series in REMOVE_SERIES:
+                if series in a:
+                    a = a.replace(series+" Series","")
+                    break
     return a.strip()
 
-def cmp_titles(titles_a,titles_b, rules=ALL_RULES):
+@lru_cache(maxsize=PREPARED_CACHE_SIZE)
+def prepare_title(a):
+    """
+    returns the :PreparedTitle: for title string :a:.
+    Results are kept in a bounded LRU cache, so every title is normalized
+    only once per run (call :prepare_title.cache_clear(): after changing REMOVE_SERIES).
+    """
+    return PreparedTitle(_pre_processing(a))
+
+instrumentation.register_cache("prepare_title", prepare_title)
+instrumentation.register_cache("roman_value", _roman_value)
+
+def _prepared(titles):
+    return [ a if isinstance(a, PreparedTitle) else prepare_title(a) for a in titles ]
+
+def _max_ratio(a, b):
+    """
+    upper bound of lev.ratio for strings :a: and :b: given only their lengths
+    """
+    lensum = len(a) + len(b)
+    if lensum == 0:
+        return 1.0
+    return 2*min(len(a), len(b)) / lensum
+
+def cmp_titles(titles_a,titles_b, rules=ALL_RULES, score_cutoff=None):
     """
     Returns match value for two lists of titles.
 
-    :titles_a: List of title strings
-    :titles_b: List of title string
-    :rules:    List of matching rules
+    :titles_a: List of title strings (or PreparedTitle objects)
+    :titles_b: List of title string (or PreparedTitle objects)
+    :rules:    List of matching rules (or a RuleEngine), called with two PreparedTitle objects
+    :score_cutoff: If set, 0 is returned for values below the cutoff. Pairs which
+                   cannot reach the cutoff (or the best value so far) are skipped
+                   without running the rules, and the comparison stops at a value of 1.
+                   Assumes that rules only return non-negative penalties.
     """
+    stats = instrumentation.STATS
+    engine = get_engine(rules)
+    if stats is not None:
+        start = perf_counter()
+    titles_a, titles_b = _prepared(titles_a), _prepared(titles_b)
+    if stats is not None:
+        stats.time_stage("preprocessing", perf_counter() - start)
+        stats.calls += 1
+        stats.pairs += len(titles_a) * len(titles_b)
+
     best_ratio = 0
     for a, b in product(titles_a, titles_b):
-        a = _pre_processing(a)
-        b = _pre_processing(b)
+        if a.pre and b.pre:
+            if stats is not None:
+                start = perf_counter()
+            if score_cutoff is not None:
+                bound = max(score_cutoff, best_ratio)
+                if _max_ratio(a.std_no_numbers, b.std_no_numbers) < bound - CUTOFF_EPSILON:
+                    ratio = None
+                else:
+                    ratio = lev.ratio(a.std_no_numbers, b.std_no_numbers)
+                    if ratio < score_cutoff or ratio <= best_ratio:
+                        ratio = None
+            else:
+                ratio = lev.ratio(a.std_no_numbers, b.std_no_numbers)
 
-        if a and b:
-            weights = [ rule(a,b) for rule in rules ]
+            if stats is not None:
+                stats.time_stage("ratio", perf_counter() - start)
+                if ratio is None:
+                    stats.skipped_pairs += 1
+            if ratio is None:
+                continue
 
-            a_no_numbers = remove_numbers(a)
-            b_no_numbers = remove_numbers(b)
+            penalty = engine.penalty(a, b, ratio, best_ratio, score_cutoff, stats)
+            if penalty is None:
+                if stats is not None:
+                    stats.skipped_pairs += 1
+                continue
 
-            r = lev.ratio(std(a_no_numbers),std(b_no_numbers)) - sum(weights)
+            r = ratio - penalty
 
             if r > best_ratio: best_ratio = r
 
+            if score_cutoff is not None and best_ratio >= 1:
+                break
+
+    if score_cutoff is not None and best_ratio < score_cutoff:
+        return 0
     return best_ratio
@@ -3,3 +3,28 @@
 FIRST_LETTER_WEIGHT = 0.26
 NUMBERING_WEIGHT = 0.26
 
+# CACHING
+PREPARED_CACHE_SIZE = 2**16
+
+# SCORE CUTOFF
+# tolerance for the length based upper bound of lev.ratio
+CUTOFF_EPSILON = 1e-9
+
+# LINKING
+LINK_THRESHOLD = 0.85
+QGRAM_SIZE = 3
+MIN_QGRAM_OVERLAP = 0.5
+MAX_BLOCK_SIZE = 1000
+
+# PARALLEL LINKING
+CHUNK_SIZE = 256
+
+# INSTRUMENTATION
+# number of most recent timings per stage/rule kept for percentiles
+TIMING_SAMPLES = 10000
+
+# SERVER
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_MAX_BATCH_SIZE = 64
+SERVER_MAX_WAIT = 0.005
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+corpus module writes and memory-maps precomputed title corpus files.
+
+A corpus file holds the original titles, their _pre_processing, std and
+std/remove_numbers forms and numerals, so worker processes share the pages
+of one file instead of normalizing the title dictionary at startup.
+The file is versioned with a fingerprint of the normalization code and is
+rebuilt by load_corpus when it is stale.
+"""
+
+import hashlib
+import inspect
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from .comp import _pre_processing, prepare_title, REMOVE_SERIES
+from .helpers import std, remove_numbers, extract_all_numbers, Numeral, PreparedTitle
+from . import helpers
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+MAGIC = b"GTCORPUS"
+FORMAT_VERSION = 1
+
+#magic, format version, fingerprint, number of titles, number of numerals
+HEADER = struct.Struct("<8sH40sQQ")
+
+#string columns per title
+FIELDS = ["title", "pre", "std", "std_no_numbers"]
+NUMERAL_TYPES = ["number", "year", "roman"]
+
+#sections (name, dtype, length as function of (n_titles, n_numerals)), stored after the header in this order
+SECTIONS = [
+    ("string_offsets", np.uint64, lambda n, m: n*len(FIELDS) + 1),
+    ("numeral_offsets", np.uint64, lambda n, m: n + 1),
+    ("numeral_values", np.float64, lambda n, m: m),
+    ("numeral_spans", np.uint32, lambda n, m: 2*m),
+    ("numeral_types", np.uint8, lambda n, m: m),
+]
+
+
+def fingerprint(source=None):
+    """
+    returns a fingerprint of the normalization code, the series list and
+    (optional) the bytes of title list file :source:
+    """
+    h = hashlib.sha1()
+    h.update(str(FORMAT_VERSION).encode())
+    for func in [_pre_processing, std, remove_numbers, extract_all_numbers]:
+        h.update(inspect.getsource(func).encode("utf-8"))
+    h.update(helpers.NUMERAL_RE.pattern.encode("utf-8"))
+    h.update("\n".join(REMOVE_SERIES).encode("utf-8"))
+    if source is not None:
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def _align(n, to=8):
+    return (n + to - 1) // to * to
+
+
+def build_corpus(titles, filepath, source=None):
+    """
+    writes the corpus file :filepath: for list of :titles:
+    (:source: is the title list file the titles were loaded from, part of the fingerprint)
+    """
+    blob = bytearray()
+    string_offsets = [0]
+    numeral_offsets = [0]
+    numeral_values, numeral_spans, numeral_types = [], [], []
+
+    for title in titles:
+        prepared = prepare_title(title)
+        for value in (title, prepared.pre, prepared.std, prepared.std_no_numbers):
+            blob += value.encode("utf-8")
+            string_offsets.append(len(blob))
+        for n in prepared.numbers:
+            numeral_values.append(n.value)
+            numeral_spans.extend((n.start, n.end))
+            numeral_types.append(NUMERAL_TYPES.index(n.type))
+        numeral_offsets.append(len(numeral_values))
+
+    arrays = {
+        "string_offsets": string_offsets,
+        "numeral_offsets": numeral_offsets,
+        "numeral_values": numeral_values,
+        "numeral_spans": numeral_spans,
+        "numeral_types": numeral_types,
+    }
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, fingerprint(source).encode("ascii"),
+                         len(string_offsets) // len(FIELDS), len(numeral_values))
+
+    tmp_filepath = "{0}.{1}.tmp".format(filepath, os.getpid())
+    with open(tmp_filepath, "wb") as f:
+        f.write(header)
+        for name, dtype, _ in SECTIONS:
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(np.asarray(arrays[name], dtype=dtype).tobytes())
+        f.write(bytes(blob))
+    os.replace(tmp_filepath, filepath)
+
+
+class TitleCorpus(object):
+    """
+    Read-only, memory-mapped corpus file
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            magic, version = None, None
+        else:
+            magic, version, fp, n, m = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError("{0} is not a title corpus file of version {1}".format(filepath, FORMAT_VERSION))
+        self.fingerprint = fp.decode("ascii")
+
+        offset = HEADER.size
+        for name, dtype, length in SECTIONS:
+            offset = _align(offset)
+            nbytes = length(n, m) * np.dtype(dtype).itemsize
+            if offset + nbytes > len(self._mmap):
+                break
+            setattr(self, "_" + name, np.frombuffer(self._mmap, dtype=dtype, count=length(n, m), offset=offset))
+            offset += nbytes
+        #truncated files would otherwise return cut strings
+        if not hasattr(self, "_" + SECTIONS[-1][0]) or offset + int(self._string_offsets[-1]) != len(self._mmap):
+            self.close()
+            raise ValueError("{0} is a damaged title corpus file".format(filepath))
+        self._blob_offset = offset
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def close(self):
+        for name, _, _ in SECTIONS:
+            self.__dict__.pop("_" + name, None)
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def is_stale(self, source=None):
+        """ checks if the corpus was built with different normalization code (or title list :source:) """
+        return self.fingerprint != fingerprint(source)
+
+    def _string(self, i, field):
+        k = i*len(FIELDS) + field
+        start = self._blob_offset + int(self._string_offsets[k])
+        end = self._blob_offset + int(self._string_offsets[k+1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def title(self, i):
+        """ returns the original title :i: """
+        return self._string(i, 0)
+
+    def titles(self):
+        """ returns the list of all original titles """
+        return [ self.title(i) for i in range(self._n) ]
+
+    def numbers(self, i):
+        """ returns the Numeral records of title :i: (as extract_all_numbers) """
+        pre = self._string(i, 1)
+        numbers = []
+        for j in range(int(self._numeral_offsets[i]), int(self._numeral_offsets[i+1])):
+            ntype = NUMERAL_TYPES[self._numeral_types[j]]
+            value = float(self._numeral_values[j])
+            if ntype == "year":
+                value = int(value)
+            start, end = int(self._numeral_spans[2*j]), int(self._numeral_spans[2*j+1])
+            numbers.append(Numeral(ntype, value, pre[start:end], helpers._position_class(pre, start, end), start, end))
+        return numbers
+
+    def prepared(self, i):
+        """ returns the PreparedTitle of title :i: without normalizing it again """
+        return PreparedTitle.from_fields(self._string(i, 1), self._string(i, 2),
+                                         self._string(i, 3), self.numbers(i))
+
+    def prepared_titles(self):
+        """ returns the list of all PreparedTitle objects """
+        return [ self.prepared(i) for i in range(self._n) ]
+
+
+def load_corpus(filepath, title_list=None):
+    """
+    opens corpus file :filepath:. If :title_list: (JSON list of titles) is given,
+    the corpus is (re)built first if it does not exist, is stale, of another format version or damaged.
+    """
+    if title_list is not None:
+        if os.path.isfile(filepath):
+            try:
+                corpus = TitleCorpus(filepath)
+            except ValueError:
+                corpus = None
+            if corpus is not None:
+                if not corpus.is_stale(title_list):
+                    return corpus
+                corpus.close()
+        with open(title_list) as f:
+            build_corpus(json.load(f), filepath, source=title_list)
+    return TitleCorpus(filepath)
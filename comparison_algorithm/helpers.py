@@ -8,6 +8,8 @@ import roman
 import re
 import string
 import os
+from collections import namedtuple
+from functools import lru_cache
 
 __author__ = "Florian Rämisch and Peter Mühleder"
 __copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
@@ -16,6 +18,7 @@ __email__ = "team@diggr.link"
 
 #CONSTANTS
 PUNCT_TRANSTABLE = str.maketrans("","",".,:-〔〕'’*/!&?+ ")
+PUNCT_ASCII = b".,:-'*/!&?+ "
 REMOVE_TM = ["™","®","(TM)", "(R)"]
 
 
@@ -25,6 +28,19 @@ NUMBERING_REGEX = r'(\d+\.\d+|\d+)'
 
 NUMBERING_RE = re.compile(NUMBERING_REGEX)
 ROMAN_NUMERAL_RE = re.compile(ROMAN_NUMERAL_REGEX)
+#single scan for arabic and roman numerals, the lookahead skips positions which cannot start a numeral
+NUMERAL_RE = re.compile(r'(?=[\dMDCLXVI])(?:(?P<number>{0})|(?P<roman>{1}))'.format(NUMBERING_REGEX, ROMAN_NUMERAL_REGEX))
+
+
+#NUMERAL RECORDS
+Numeral = namedtuple("Numeral", ["type", "value", "str", "position", "start", "end"])
+
+
+def compile_alternation(strings):
+    """
+    returns a compiled regular expression matching any of :strings:
+    """
+    return re.compile("|".join(re.escape(x) for x in sorted(strings, key=len, reverse=True)))
 
 
 def load_excluded_titles():
@@ -73,10 +89,14 @@ def std(a):
     """
     if a:
         a = a.replace("The"," "). replace("・", " ").replace("THE", " ").replace("the", " ")
-        #remove punctuations
-        a = a.translate(PUNCT_TRANSTABLE)
-        #remove macrons
-        a = a.replace("ō", "o").replace("Ō", "O").replace("ū", "u").replace("Ū", "U")
+        if a.isascii():
+            #remove punctuations (bytes.translate is much faster than str.translate)
+            a = a.encode("ascii").translate(None, PUNCT_ASCII).decode("ascii")
+        else:
+            #remove punctuations
+            a = a.translate(PUNCT_TRANSTABLE)
+            #remove macrons
+            a = a.replace("ō", "o").replace("Ō", "O").replace("ū", "u").replace("Ū", "U")
         a = a.replace("ou", "o").replace("Ou", "O").replace("uu", "u").replace("Uu", "U").replace("nb", "mb")
         #remove blanks, lower case, strip string
         a = a.lower()
@@ -84,82 +104,84 @@ def std(a):
     else:
         return ""
 
-def _get_position(a, n):
-    """ returns position of substring :n: as "start", "end" or "middle" """
-    position = a.index(n)
-    if position == 0:
-        return ("start", position)
-    elif position+len(n) == len(a):
-        return ("end", position)
-    else:
-        return ("middle", position)
-
-
-def _extract_roman_numerals(a):
-    """ extracts all roman numerals in string :a:, including their position and numerical value """
-    rv = ROMAN_NUMERAL_RE.findall(a)
-    rv = [no[0] for no in rv ]
+@lru_cache(maxsize=None)
+def _roman_value(n):
+    """ returns the value of roman numeral :n: as float """
+    return float(roman.fromRoman(n))
 
-    numbers = []
 
-    for n in rv:
-        position = _get_position(a, n)
+def _position_class(a, start, end):
+    """ returns position of substring :a:[start:end] as "start", "end" or "middle" """
+    if start == 0:
+        return "start"
+    elif end == len(a):
+        return "end"
+    else:
+        return "middle"
 
-        numbers.append({
-            "type": "roman",
-            "value": float(roman.fromRoman(n)),
-            "position": position,
-            "str": n
-        })
-    return numbers
 
-def _extract_numbers(a):
+def extract_all_numbers(a):
     """
-    returns all numbers in string :a:, their position and value als float.
-    if number is identified as year, only the last two digits get set as value
+    returns all numbers (roman and arabic) in string :a: as Numeral records
+    (type, value, str, position, start, end), the last numeral first.
+    if a number is identified as year, only the last two digits get set as value
     """
-
-    rv = NUMBERING_RE.findall(a)
-
     numbers = []
+    for match in NUMERAL_RE.finditer(a):
+        n = match.group()
+        start, end = match.span()
 
-    for n in rv:
-
-        position = _get_position(a, n)
-
+        if match.lastgroup == "roman":
+            ntype = "roman"
+            value = _roman_value(n)
         #check if year
-        if len(n) == 4 and n[0] in "12" and "." not in n:
+        elif len(n) == 4 and n[0] in "12" and "." not in n:
             ntype = "year"
             value = int(n[2:])
         elif len(n) == 2 and n[0] in "890" and "." not in n:
             ntype = "year"
             value = int(n)
-        #elso convert value to float
+        #else convert value to float
         else:
             ntype = "number"
             value = float(n)
 
-        numbers.append({
-            "type": ntype,
-            "value": value,
-            "position": position,
-            "str": n
-        })
+        numbers.append(Numeral(ntype, value, n, _position_class(a, start, end), start, end))
 
+    numbers.reverse()
     return numbers
 
-def extract_all_numbers(a):
-    """ returns all numbers (roman and arabic) in string :a: """
-
-    numbers = _extract_numbers(a) + _extract_roman_numerals(a)
-    sorted_numbers = sorted(numbers, key=lambda x: -x["position"][1])
-
-    return sorted_numbers
-
 
 def remove_numbers(a):
     """ removes all numbers (arabic and roman) from string a """
     a = NUMBERING_RE.sub("", a)
     a = ROMAN_NUMERAL_RE.sub("",a)
     a = re.sub(" +", " ", a)
-    return a.replace(" :", ":").strip()
\ No newline at end of file
+    return a.replace(" :", ":").strip()
+
+
+class PreparedTitle(object):
+    """
+    preprocessed title string :pre: together with its standardized forms and
+    numerals, computed once and reused by every comparison of the title
+    """
+    __slots__ = ("pre", "std", "std_no_numbers", "numbers")
+
+    def __init__(self, pre):
+        self.pre = pre
+        self.std = std(pre)
+        self.std_no_numbers = std(remove_numbers(pre))
+        self.numbers = extract_all_numbers(pre)
+
+    @classmethod
+    def from_fields(cls, pre, std, std_no_numbers, numbers):
+        """ returns a PreparedTitle from precomputed fields (e.g. a TitleCorpus file) """
+        title = cls.__new__(cls)
+        title.pre = pre
+        title.std = std
+        title.std_no_numbers = std_no_numbers
+        title.numbers = numbers
+        return title
+
+    def __repr__(self):
+        return "PreparedTitle({!r})".format(self.pre)
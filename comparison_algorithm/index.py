@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+index module for searching the best matching titles in a title list
+"""
+
+import heapq
+from .comp import cmp_titles, _prepared, ALL_RULES
+from .linking import BlockIndex
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+class TitleIndex(object):
+    """
+    Top-k title search over a list of :titles: (e.g. the NER dictionary).
+    The index is built once; queries look up candidates in an inverted
+    q-gram/blocking key index and rescore them exactly with cmp_titles.
+    """
+
+    def __init__(self, titles, rules=ALL_RULES, prepared=None, **index_args):
+        """
+        :prepared: optional list of PreparedTitle objects of :titles: (e.g. from a TitleCorpus)
+        """
+        self.titles = list(titles)
+        self.rules = rules
+        prepared = self.titles if prepared is None else prepared
+        self.index = BlockIndex(( (i, [title]) for i, title in enumerate(prepared) ), **index_args)
+
+    @classmethod
+    def from_corpus(cls, corpus, **kwargs):
+        """ builds the index from a precomputed TitleCorpus without normalizing the titles again """
+        return cls(corpus.titles(), prepared=corpus.prepared_titles(), **kwargs)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def query(self, title, k=10, min_score=0.0):
+        """
+        returns the :k: best matches (:title:, :score:) for :title: (string or PreparedTitle)
+        with a score >= :min_score:, sorted by score (ties in order of the title list)
+        """
+        title = _prepared([title])[0]
+        matches = []
+        for pos in self.index.candidates([title]):
+            score = cmp_titles([title], self.index.titles[pos], rules=self.rules, score_cutoff=min_score)
+            if score >= min_score and score > 0:
+                matches.append((score, -pos))
+        return [ (self.titles[-pos], score) for score, pos in heapq.nlargest(k, matches) ]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+instrumentation module collects opt-in timings and counters of cmp_titles.
+While disabled (default) cmp_titles only checks STATS for None.
+
+with instrument() as stats:
+    cmp_titles(...)
+print(stats.snapshot())
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from .config import *
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+#ACTIVE STATISTICS (None: disabled)
+STATS = None
+
+#LRU CACHES REPORTED IN SNAPSHOTS
+CACHES = {}
+
+PERCENTILES = [50, 90, 99]
+
+
+def register_cache(name, func):
+    """
+    registers lru_cache decorated function :func: for cache hit rates in snapshots
+    """
+    CACHES[name] = func
+
+
+class Timing(object):
+    """
+    call count, cumulative time and the most recent :TIMING_SAMPLES: durations of a stage
+    """
+    __slots__ = ("count", "total", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=TIMING_SAMPLES)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.samples.append(duration)
+
+    def snapshot(self):
+        samples = sorted(self.samples)
+        result = {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0
+        }
+        for p in PERCENTILES:
+            result["p{0}".format(p)] = samples[int(p / 100 * (len(samples) - 1))] if samples else 0.0
+        return result
+
+
+class Stats(object):
+    """
+    timings per stage ("preprocessing", "ratio", "rules") and per rule,
+    number of calls, compared and skipped pairs of cmp_titles
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.pairs = 0
+        self.skipped_pairs = 0
+        self.stages = {}
+        self.rules = {}
+
+    def time_stage(self, name, duration):
+        timing = self.stages.get(name)
+        if timing is None:
+            timing = self.stages[name] = Timing()
+        timing.add(duration)
+
+    def time_rule(self, name, duration):
+        timing = self.rules.get(name)
+        if timing is None:
+            timing = self.rules[name] = Timing()
+        timing.add(duration)
+
+    def snapshot(self):
+        """
+        returns the collected statistics and the hit rates of registered caches as dict
+        """
+        caches = {}
+        for name, func in CACHES.items():
+            info = func.cache_info()
+            lookups = info.hits + info.misses
+            caches[name] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+                "hit_rate": info.hits / lookups if lookups else 0.0
+            }
+        return {
+            "calls": self.calls,
+            "pairs": self.pairs,
+            "avg_pairs": self.pairs / self.calls if self.calls else 0.0,
+            "skipped_pairs": self.skipped_pairs,
+            "stages": { name: t.snapshot() for name, t in self.stages.items() },
+            "rules": { name: t.snapshot() for name, t in self.rules.items() },
+            "caches": caches
+        }
+
+
+def enable():
+    """
+    enables instrumentation with new statistics and returns them
+    """
+    global STATS
+    STATS = Stats()
+    return STATS
+
+
+def disable():
+    global STATS
+    STATS = None
+
+
+def snapshot():
+    """
+    returns a snapshot of the active statistics, None if instrumentation is disabled
+    """
+    if STATS is None:
+        return None
+    return STATS.snapshot()
+
+
+@contextmanager
+def instrument():
+    """
+    context manager enabling instrumentation with new statistics,
+    the previous state is restored on exit
+    """
+    global STATS
+    previous = STATS
+    stats = enable()
+    try:
+        yield stats
+    finally:
+        STATS = previous
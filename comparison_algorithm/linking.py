@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+linking module for linking two datasets of game records by their titles.
+Candidate pairs are generated via blocking keys before they are scored with cmp_titles.
+"""
+
+from collections import defaultdict, Counter
+from math import ceil
+from .comp import cmp_titles, _prepared, ALL_RULES
+from .helpers import std
+from .config import *
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+def qgrams(a, q=QGRAM_SIZE):
+    """
+    returns the set of character q-grams of string :a:
+    (strings shorter than :q: are their own single q-gram)
+    """
+    if not a:
+        return set()
+    if len(a) <= q:
+        return {a}
+    return { a[i:i+q] for i in range(len(a)-q+1) }
+
+
+def first_token(title):
+    """
+    returns the first non-empty standardized word of PreparedTitle :title:
+    """
+    for word in title.pre.split(" "):
+        token = std(word)
+        if token:
+            return token
+    return ""
+
+
+def blocking_keys(title):
+    """
+    returns the exact blocking keys of PreparedTitle :title::
+    the standardized first token and the numbering signature (first token and
+    value of the numeral used by numbering_rule). The numbering signature splits
+    up large first token blocks (e.g. "super") that are dropped as too unspecific.
+    """
+    keys = set()
+    token = first_token(title)
+    if token:
+        keys.add(("token", token))
+        if title.numbers:
+            keys.add(("numbering", token, title.numbers[0].value))
+    return keys
+
+
+class BlockIndex(object):
+    """
+    Index over a list of records (:id:, :titles:) for candidate generation.
+
+    A record is a candidate for a set of titles if it shares an exact blocking key,
+    or if one of its titles shares at least :min_qgram_overlap: of the q-grams of
+    a standardized title. Keys shared by more than :max_block_size: records are ignored.
+    """
+
+    def __init__(self, records, q=QGRAM_SIZE, min_qgram_overlap=MIN_QGRAM_OVERLAP,
+                 max_block_size=MAX_BLOCK_SIZE):
+        self.q = q
+        self.min_qgram_overlap = min_qgram_overlap
+        self.max_block_size = max_block_size
+        self.ids = []
+        self.titles = []
+        self.blocks = defaultdict(set)
+        self.qgram_blocks = defaultdict(set)
+
+        for pos, (record_id, titles) in enumerate(records):
+            titles = _prepared(titles)
+            self.ids.append(record_id)
+            self.titles.append(titles)
+            for title in titles:
+                for key in blocking_keys(title):
+                    self.blocks[key].add(pos)
+                for gram in qgrams(title.std_no_numbers, q):
+                    self.qgram_blocks[gram].add(pos)
+
+        for blocks in (self.blocks, self.qgram_blocks):
+            for key in [ k for k, v in blocks.items() if len(v) > max_block_size ]:
+                del blocks[key]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def candidates(self, titles):
+        """
+        returns the sorted positions of all candidate records for list of :titles:
+        """
+        candidates = set()
+        for title in _prepared(titles):
+            for key in blocking_keys(title):
+                candidates.update(self.blocks.get(key, ()))
+
+            grams = [ g for g in qgrams(title.std_no_numbers, self.q) if g in self.qgram_blocks ]
+            if grams:
+                min_shared = ceil(self.min_qgram_overlap * len(grams))
+                counts = Counter()
+                for gram in grams:
+                    counts.update(self.qgram_blocks[gram])
+                candidates.update(pos for pos, n in counts.items() if n >= min_shared)
+        return sorted(candidates)
+
+    def match(self, titles, threshold=LINK_THRESHOLD, rules=ALL_RULES):
+        """
+        yields (:id:, :score:) of all indexed records whose score with :titles: is >= :threshold:
+        """
+        titles = _prepared(titles)
+        for pos in self.candidates(titles):
+            score = cmp_titles(titles, self.titles[pos], rules=rules, score_cutoff=threshold)
+            if score >= threshold:
+                yield self.ids[pos], score
+
+
+def link_datasets(records_a, records_b, threshold=LINK_THRESHOLD, rules=ALL_RULES, **index_args):
+    """
+    Links two datasets and yields matches (:id_a:, :id_b:, :score:) as a stream.
+
+    :records_a: Iterable of (id, list of titles), consumed lazily
+    :records_b: Iterable of (id, list of titles), indexed in memory
+    :threshold: Minimum score of a match
+    :rules:     List of matching rules
+    :index_args: Blocking parameters passed to BlockIndex
+    """
+    index = BlockIndex(records_b, **index_args)
+    for id_a, titles_a in records_a:
+        for id_b, score in index.match(titles_a, threshold, rules):
+            yield id_a, id_b, score
+
+
+def evaluate_blocking(records_a, records_b, threshold=LINK_THRESHOLD, rules=ALL_RULES, **index_args):
+    """
+    Compares blocked linking with the brute-force loop over all pairs
+    (use a sample of the datasets) and returns a report of the lost recall.
+    """
+    records_a, records_b = list(records_a), list(records_b)
+    index = BlockIndex(records_b, **index_args)
+
+    n_candidates = 0
+    true_matches, found_matches = 0, 0
+    for _, titles_a in records_a:
+        candidates = set(index.candidates(titles_a))
+        n_candidates += len(candidates)
+        for pos, (_, titles_b) in enumerate(records_b):
+            if cmp_titles(titles_a, titles_b, rules=rules, score_cutoff=threshold) >= threshold:
+                true_matches += 1
+                if pos in candidates:
+                    found_matches += 1
+
+    n_pairs = len(records_a) * len(records_b)
+    return {
+        "pairs": n_pairs,
+        "candidates": n_candidates,
+        "reduction_ratio": 1 - n_candidates / n_pairs if n_pairs else 0.0,
+        "true_matches": true_matches,
+        "found_matches": found_matches,
+        "recall": found_matches / true_matches if true_matches else 1.0,
+        "lost_recall": 1 - found_matches / true_matches if true_matches else 0.0
+    }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+matrix module computes cmp_titles scores for many title sets at once
+"""
+
+import numpy as np
+import Levenshtein as lev
+from .comp import _prepared
+from .helpers import std
+from .config import *
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+class _Vocabulary(dict):
+    """ maps strings to integer ids, so string comparisons become array comparisons """
+
+    def id(self, a):
+        return self.setdefault(a, len(self))
+
+
+def _flatten(title_sets):
+    """ returns all prepared titles of :title_sets: and the start offset of each set """
+    titles, starts = [], []
+    for titles_ in title_sets:
+        starts.append(len(titles))
+        titles.extend(_prepared(titles_))
+    return titles, np.array(starts, dtype=np.intp)
+
+
+def _features(titles, vocab):
+    """
+    returns the arrays of title features used by the vectorized rules
+    """
+    n = len(titles)
+    features = {
+        "valid": np.zeros(n, dtype=bool),
+        "one_word": np.zeros(n, dtype=bool),
+        "first_letter": np.full(n, -1, dtype=np.intp),
+        "std": np.zeros(n, dtype=np.intp),
+        "num_value": np.full(n, np.nan),
+        "num_middle": np.zeros(n, dtype=bool),
+        "num_check": np.full(n, -1, dtype=np.intp),
+        "std_no_numbers": np.zeros(n, dtype=np.intp),
+    }
+    unique_no_numbers = _Vocabulary()
+
+    for i, title in enumerate(titles):
+        features["std_no_numbers"][i] = unique_no_numbers.id(title.std_no_numbers)
+        if not title.pre:
+            continue
+        features["valid"][i] = True
+        features["one_word"][i] = len(title.pre.split(" ")) == 1
+        features["first_letter"][i] = vocab.id(title.pre[0].lower())
+        features["std"][i] = vocab.id(title.std)
+        if title.numbers:
+            number = title.numbers[0]
+            features["num_value"][i] = number.value
+            if number.position == "middle":
+                features["num_middle"][i] = True
+                features["num_check"][i] = vocab.id(std(title.pre.replace(number.str, "")))
+
+    return features, list(unique_no_numbers)
+
+
+def _first_letter_weights(fa, fb):
+    """ vectorized first_letter_rule """
+    mismatch = (fa["one_word"][:, None] & fb["one_word"][None, :]
+                & (fa["first_letter"][:, None] != fb["first_letter"][None, :]))
+    return np.where(mismatch, FIRST_LETTER_WEIGHT, 0.0)
+
+
+def _numbering_weights(fa, fb):
+    """ vectorized numbering_rule """
+    has_a = ~np.isnan(fa["num_value"])[:, None]
+    has_b = ~np.isnan(fb["num_value"])[None, :]
+
+    equal = (fa["num_value"][:, None] == fb["num_value"][None, :]) | (~has_a & ~has_b)
+    middle_a = fa["num_middle"][:, None] & ~has_b & (fa["num_check"][:, None] == fb["std"][None, :])
+    middle_b = fb["num_middle"][None, :] & ~has_a & (fb["num_check"][None, :] == fa["std"][:, None])
+
+    return np.where(equal | middle_a | middle_b, 0.0, NUMBERING_WEIGHT)
+
+
+def cmp_titles_matrix(sets_a, sets_b):
+    """
+    Returns a matrix of match values for two lists of title sets,
+    with the same values as cmp_titles(sets_a[i], sets_b[j]) with the default rules.
+
+    :sets_a: List of lists of title strings (or PreparedTitle objects)
+    :sets_b: List of lists of title strings (or PreparedTitle objects)
+    """
+    titles_a, starts_a = _flatten(sets_a)
+    titles_b, starts_b = _flatten(sets_b)
+    scores = np.zeros((len(starts_a), len(starts_b)))
+    if not titles_a or not titles_b:
+        return scores
+
+    vocab = _Vocabulary()
+    fa, strings_a = _features(titles_a, vocab)
+    fb, strings_b = _features(titles_b, vocab)
+
+    ratios = np.array([ [ lev.ratio(x, y) for y in strings_b ] for x in strings_a ])
+    ratios = ratios[fa["std_no_numbers"]][:, fb["std_no_numbers"]]
+
+    # same summation order as sum(weights) in cmp_titles
+    weights = _first_letter_weights(fa, fb) + _numbering_weights(fa, fb)
+    title_scores = ratios - weights
+    title_scores[~(fa["valid"][:, None] & fb["valid"][None, :])] = 0.0
+    np.maximum(title_scores, 0.0, out=title_scores)
+
+    # best value per pair of sets, empty sets keep a value of 0
+    rows = np.diff(np.append(starts_a, len(titles_a))) > 0
+    cols = np.diff(np.append(starts_b, len(titles_b))) > 0
+    set_scores = np.maximum.reduceat(title_scores, starts_a[rows], axis=0)
+    set_scores = np.maximum.reduceat(set_scores, starts_b[cols], axis=1)
+    scores[np.ix_(rows, cols)] = set_scores
+    return scores
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+parallel module for linking datasets with a pool of worker processes
+"""
+
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from .comp import ALL_RULES
+from .linking import BlockIndex
+from .config import *
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+#WORKER STATE
+_INDEX = None
+
+
+def _init_worker(records_b, index_args):
+    """
+    builds the BlockIndex (and thereby the prepared titles) of :records_b: once per worker.
+    REMOVE_SERIES is loaded once when the worker imports the comp module.
+    """
+    global _INDEX
+    _INDEX = BlockIndex(records_b, **index_args)
+
+
+def _link_chunk(chunk, threshold, rules):
+    """ returns the number of records in :chunk: and all their matches in input order """
+    return len(chunk), [ (id_a, id_b, score)
+                         for id_a, titles_a in chunk
+                         for id_b, score in _INDEX.match(titles_a, threshold, rules) ]
+
+
+def chunks(items, chunk_size):
+    """ yields lists of :chunk_size: items """
+    items = iter(items)
+    chunk = list(islice(items, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, chunk_size))
+
+
+def imap_ordered(func, chunk_iter, jobs, initializer=None, initargs=(), args=()):
+    """
+    calls :func:(chunk, *:args:) for every chunk of iterable :chunk_iter: in a pool of :jobs: processes
+    (started with :initializer:(*:initargs:)) and yields the results in input order.
+    At most 2 * :jobs: chunks are in flight at a time, so :chunk_iter: is consumed lazily.
+    """
+    with Pool(jobs, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for chunk in chunk_iter:
+            pending.append(pool.apply_async(func, (chunk,) + tuple(args)))
+            if len(pending) >= 2*jobs:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def link_chunks(records_a, records_b, threshold=LINK_THRESHOLD, rules=ALL_RULES,
+                jobs=None, chunk_size=CHUNK_SIZE, **index_args):
+    """
+    Links :records_a: in chunks of :chunk_size: records against :records_b: and yields
+    (number of records, list of matches) for every chunk in input order.
+    With :jobs: > 1 (default: number of CPUs) the chunks are distributed over a process pool,
+    at most 2 * :jobs: chunks are in flight at a time.
+    """
+    global _INDEX
+    jobs = jobs or cpu_count()
+    records_b = list(records_b)
+
+    if jobs == 1:
+        _init_worker(records_b, index_args)
+        try:
+            for chunk in chunks(records_a, chunk_size):
+                yield _link_chunk(chunk, threshold, rules)
+        finally:
+            _INDEX = None
+        return
+
+    yield from imap_ordered(_link_chunk, chunks(records_a, chunk_size), jobs,
+                            _init_worker, (records_b, index_args), (threshold, rules))
+
+
+def link_datasets_parallel(records_a, records_b, threshold=LINK_THRESHOLD, rules=ALL_RULES,
+                           jobs=None, chunk_size=CHUNK_SIZE, **index_args):
+    """
+    Links two datasets like link_datasets, using :jobs: worker processes
+    (default: number of CPUs). :records_a: is distributed in chunks of :chunk_size:
+    records; matches are yielded in the same order as link_datasets yields them.
+    """
+    for _, matches in link_chunks(records_a, records_b, threshold, rules, jobs, chunk_size, **index_args):
+        yield from matches
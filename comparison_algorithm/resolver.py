@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+resolver module for mapping title spans (e.g. NER matches) to canonical titles of a title list
+"""
+
+from .comp import cmp_titles, prepare_title, _prepared, ALL_RULES
+from .helpers import std, remove_numbers
+from .index import TitleIndex
+from .config import *
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+def title_key(title):
+    """
+    returns the normalized key of :title: (string or PreparedTitle): its standardized form
+    without numerals and the values of its numerals, so e.g. "Dark Souls II" and
+    "DARK SOULS 2" have the same key
+    """
+    prepared = prepare_title(title) if isinstance(title, str) else title
+    #std is case sensitive for some replacements ("The", "ou"), so the key is lowered first
+    return (std(remove_numbers(prepared.pre).lower()), tuple( n.value for n in prepared.numbers ))
+
+
+class TitleResolver(object):
+    """
+    Resolves title spans to titles of list :titles: (e.g. the NER dictionary).
+
+    The normalized keys of all titles are kept in a hash map, so spans with the key of
+    a title are resolved by scoring only the titles with that key. Other spans fall back to
+    a TitleIndex search, which is built on the first miss.
+    """
+
+    def __init__(self, titles, rules=ALL_RULES, min_score=LINK_THRESHOLD, prepared=None, **index_args):
+        """
+        :min_score: minimum cmp_titles score of a resolved title
+        :prepared: optional list of PreparedTitle objects of :titles: (e.g. from a TitleCorpus)
+        """
+        self.titles = list(titles)
+        self.rules = rules
+        self.min_score = min_score
+        self.prepared = [ prepare_title(title) for title in self.titles ] if prepared is None else prepared
+        self.index_args = index_args
+        self.keys = {}
+        for pos, title in enumerate(self.prepared):
+            if title.pre:
+                self.keys.setdefault(title_key(title), []).append(pos)
+        self._index = None
+
+    @classmethod
+    def from_corpus(cls, corpus, **kwargs):
+        """ builds the resolver from a precomputed TitleCorpus without normalizing the titles again """
+        return cls(corpus.titles(), prepared=corpus.prepared_titles(), **kwargs)
+
+    def __len__(self):
+        return len(self.titles)
+
+    @property
+    def index(self):
+        """ TitleIndex of the titles for fuzzy resolution, built on first use """
+        if self._index is None:
+            self._index = TitleIndex(self.titles, self.rules, self.prepared, **self.index_args)
+        return self._index
+
+    def resolve_key(self, span):
+        """
+        returns the best title (:title:, :score:) with the normalized key of :span:
+        (string or PreparedTitle), None if no title has its key or reaches min_score
+        """
+        span = _prepared([span])[0]
+        best = None
+        for pos in self.keys.get(title_key(span), ()):
+            score = cmp_titles([span], [self.prepared[pos]], rules=self.rules)
+            if score >= self.min_score and (best is None or score > best[1]):
+                best = (self.titles[pos], score)
+        return best
+
+    def resolve(self, span, fuzzy=True):
+        """
+        returns the canonical title (:title:, :score:) of :span: (string or PreparedTitle),
+        or None if no title reaches min_score. Spans without a normalized key match are
+        searched in the TitleIndex if :fuzzy: is set.
+        """
+        span = _prepared([span])[0]
+        match = self.resolve_key(span)
+        if match is None and fuzzy:
+            matches = self.index.query(span, k=1, min_score=self.min_score)
+            if matches:
+                match = matches[0]
+        return match
+
+    def resolve_all(self, spans, fuzzy=True):
+        """ yields (:span:, :title:, :score:) for every span; title and score are None if unresolved """
+        for span in spans:
+            match = self.resolve(span, fuzzy)
+            yield (span,) + (match or (None, None))
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-module contains general matching rules
+module contains general matching rules and the rule engine evaluating them
 """
 
 
@@ -10,8 +10,11 @@ __email__ = "team@diggr.link"
 
 
 import re
+import sys
+from functools import update_wrapper, lru_cache
+from time import perf_counter
 import Levenshtein as lev
-from .helpers import std, extract_all_numbers
+from .helpers import std, PreparedTitle
 from .config import *
 
 
@@ -19,37 +22,138 @@ from .config import *
 NUMBERING_REGEX = r'(\d+.\d+|\d+)'
 
 
+class Rule(object):
+    """
+    Matching rule: :func: returns a penalty between 0 and :max_penalty: for two titles,
+    :cost: is its relative runtime cost (rules are evaluated cheapest first).
+    """
+
+    def __init__(self, func, max_penalty, cost=1):
+        update_wrapper(self, func)
+        self.func = func
+        self.max_penalty = max_penalty
+        self.cost = cost
+
+    def __call__(self, a, b):
+        return self.func(a, b)
+
+    def __repr__(self):
+        return "Rule({0}, max_penalty={1}, cost={2})".format(self.__name__, self.max_penalty, self.cost)
+
+    def __reduce__(self):
+        #module level rules are pickled by reference
+        if getattr(sys.modules.get(self.__module__), self.__name__, None) is self:
+            return self.__name__
+        return (Rule, (self.func, self.max_penalty, self.cost))
+
+
+def rule(max_penalty, cost=1):
+    """
+    decorator declaring a function as matching Rule
+    """
+    def decorator(func):
+        return Rule(func, max_penalty, cost)
+    return decorator
+
+
+class RuleEngine(object):
+    """
+    Evaluates a list of :rules: cheapest first.
+    If all rules are declared as Rule, evaluation stops as soon as a pair can no longer
+    beat the best value so far or reach the score cutoff. Plain functions are
+    evaluated in the given order without early termination.
+    """
+
+    def __init__(self, rules):
+        self.lazy = all(isinstance(r, Rule) for r in rules)
+        if self.lazy:
+            self.rules = sorted(rules, key=lambda r: r.cost)
+            self.max_penalty = sum(r.max_penalty for r in self.rules)
+        else:
+            self.rules = list(rules)
+            self.max_penalty = float("inf")
+
+    def penalty(self, a, b, ratio, best_ratio=0, score_cutoff=None, stats=None):
+        """
+        returns the summed penalty of all rules for :a: and :b:,
+        or None if :ratio: minus the penalty cannot beat :best_ratio: or reach :score_cutoff:
+        """
+        if stats is not None:
+            start = perf_counter()
+        penalty = 0
+        for r in self.rules:
+            if self.lazy and self._loses(ratio - penalty, best_ratio, score_cutoff):
+                penalty = None
+                break
+            if stats is None:
+                penalty += r(a, b)
+            else:
+                rule_start = perf_counter()
+                penalty += r(a, b)
+                stats.time_rule(r.__name__, perf_counter() - rule_start)
+        else:
+            if self.lazy and self._loses(ratio - penalty, best_ratio, score_cutoff):
+                penalty = None
+        if stats is not None:
+            stats.time_stage("rules", perf_counter() - start)
+        return penalty
+
+    @staticmethod
+    def _loses(score, best_ratio, score_cutoff):
+        return score <= best_ratio or (score_cutoff is not None and score < score_cutoff)
+
+
+@lru_cache(maxsize=32)
+def _get_engine(rules):
+    return RuleEngine(rules)
+
+
+def get_engine(rules):
+    """
+    returns the (cached) RuleEngine for list of :rules:
+    """
+    if isinstance(rules, RuleEngine):
+        return rules
+    return _get_engine(tuple(rules))
+
+
+@rule(max_penalty=NUMBERING_WEIGHT, cost=5)
 def numbering_rule(a, b):
     """ 
     Check two stings for number at the end or inbetween followed by a colon.
     If a number is found in both strings and if they do not match, return penalty value.
+    :a: and :b: can be preprocessed strings or :PreparedTitle: objects.
     """
-    
+    if not isinstance(a, PreparedTitle):
+        a = PreparedTitle(a)
+    if not isinstance(b, PreparedTitle):
+        b = PreparedTitle(b)
+
     x, y = "nan", "nan"
     x_str = ""
     y_str = ""
     x_pos = ""
     y_pos = ""
 
-    nums_a = extract_all_numbers(a)
-    nums_b = extract_all_numbers(b)
+    nums_a = a.numbers
+    nums_b = b.numbers
     if nums_a != []:
-        x = nums_a[0]["value"]
-        x_str =  nums_a[0]["str"]
-        x_pos = nums_a[0]["position"][0]
+        x = nums_a[0].value
+        x_str =  nums_a[0].str
+        x_pos = nums_a[0].position
     if nums_b != []:
-        y = nums_b[0]["value"]
-        y_str = nums_b[0]["str"]
-        y_pos = nums_b[0]["position"][0]
+        y = nums_b[0].value
+        y_str = nums_b[0].str
+        y_pos = nums_b[0].position
 
     if x_pos == "middle" and y == "nan":          
-        check = a.replace(x_str, "")
-        if lev.ratio(std(check), std(b)) == 1:
+        check = a.pre.replace(x_str, "")
+        if lev.ratio(std(check), b.std) == 1:
             return 0
 
     if y_pos == "middle" and x == "nan":
-        check = b.replace(y_str, "")
-        if lev.ratio(std(check), std(a)) == 1:
+        check = b.pre.replace(y_str, "")
+        if lev.ratio(std(check), a.std) == 1:
             return 0
 
     if x == y: 
@@ -58,10 +162,15 @@ def numbering_rule(a, b):
         return NUMBERING_WEIGHT
 
 
+@rule(max_penalty=FIRST_LETTER_WEIGHT, cost=1)
 def first_letter_rule(a,b):
     """
     checks if first letters of strings :a: and :b: when the strings contain max. 1 word
     """
+    if isinstance(a, PreparedTitle):
+        a = a.pre
+    if isinstance(b, PreparedTitle):
+        b = b.pre
     if a and b:
         if len(a.split(" ")) == 1 and len(b.split(" ")) == 1:
             if a[0].lower() != b[0].lower():
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+server module keeps series lists, prepared title caches and the title index warm
+in long-running worker processes and answers comparison requests.
+
+Requests and responses are JSON Lines over a Unix socket or TCP connection:
+
+{"id": 1, "op": "cmp", "titles_a": ["Final Fantasy VII"], "titles_b": ["FF 7"], "score_cutoff": null}
+{"id": 2, "op": "query", "title": "Final Fantasy 7", "k": 5, "min_score": 0.8}
+
+Concurrent requests are collected into micro-batches (at most :max_batch_size:
+requests or :max_wait: seconds) which are processed by the worker pool.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .comp import cmp_titles
+from .index import TitleIndex
+from .corpus import load_corpus
+from .config import *
+
+__author__ = "Florian Rämisch and Peter Mühleder"
+__copyright = "Copyright 2017, Universitätsbibliothek Leipzig"
+__email__ = "team@diggr.link"
+
+
+#WORKER STATE
+_INDEX = None
+
+
+def _init_worker(title_list=None, corpus=None):
+    """
+    builds the TitleIndex for lookups once per worker, from :corpus: (rebuilt from
+    :title_list: if stale) or from JSON :title_list:
+    """
+    global _INDEX
+    if corpus is not None:
+        with load_corpus(corpus, title_list) as title_corpus:
+            _INDEX = TitleIndex.from_corpus(title_corpus)
+    elif title_list is not None:
+        with open(title_list) as f:
+            _INDEX = TitleIndex(json.load(f))
+
+
+def _process_request(request):
+    op = request.get("op")
+    if op == "cmp":
+        return cmp_titles(request["titles_a"], request["titles_b"],
+                          score_cutoff=request.get("score_cutoff"))
+    elif op == "query":
+        if _INDEX is None:
+            raise ValueError("server was started without title list")
+        return _INDEX.query(request["title"], request.get("k", 10), request.get("min_score", 0.0))
+    raise ValueError("unknown op {0!r}".format(op))
+
+
+def _process_batch(batch):
+    """ returns a response for each request in :batch: """
+    responses = []
+    for request in batch:
+        try:
+            responses.append({"id": request.get("id"), "result": _process_request(request)})
+        except Exception as e:
+            responses.append({"id": request.get("id"), "error": "{0}: {1}".format(type(e).__name__, e)})
+    return responses
+
+
+class ComparisonServer(object):
+    """
+    asyncio front end of the worker pool.
+
+    :jobs: number of worker processes (0: process batches in a thread of this process)
+    """
+
+    def __init__(self, title_list=None, corpus=None, jobs=1,
+                 max_batch_size=SERVER_MAX_BATCH_SIZE, max_wait=SERVER_MAX_WAIT):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        if corpus is not None:
+            #(re)build a stale corpus file once, before the workers map it
+            load_corpus(corpus, title_list).close()
+        if jobs:
+            self.executor = ProcessPoolExecutor(jobs, initializer=_init_worker,
+                                                initargs=(title_list, corpus))
+        else:
+            _init_worker(title_list, corpus)
+            self.executor = ThreadPoolExecutor(1)
+        self.queue = None
+        self.server = None
+        self._batcher = None
+        #the event loop only keeps weak references to tasks
+        self._batch_tasks = set()
+
+    async def submit(self, request):
+        """ queues :request: for the next batch and returns its response """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((request, future))
+        return await future
+
+    async def _collect_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        error = "batch failed"
+        try:
+            responses = await loop.run_in_executor(self.executor, _process_batch, [ r for r, _ in batch ])
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            error = "{0}: {1}".format(type(e).__name__, e)
+        finally:
+            #every request gets a response, even if the batch failed
+            for request, future in batch:
+                if not future.done():
+                    future.set_result({"id": request.get("id"), "error": error})
+
+    async def _handle_connection(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request is not a JSON object")
+                response = await self.submit(request)
+            except ValueError as e:
+                response = {"id": None, "error": "invalid request: {0}".format(e)}
+            async with lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def start(self, path=None, host=SERVER_HOST, port=SERVER_PORT):
+        """ starts listening on Unix socket :path: or on :host:::port: """
+        self.queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._collect_batches())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        if self._batch_tasks:
+            #let in-flight batches resolve their requests
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        self.executor.shutdown()
+
+    def serve_forever(self, path=None, host=SERVER_HOST, port=SERVER_PORT):
+        async def main():
+            server = await self.start(path, host, port)
+            try:
+                await server.serve_forever()
+            finally:
+                await self.close()
+        asyncio.run(main())
@@ -0,0 +1,30 @@
+from ..benchmarks.corpus import generate_titles, generate_pairs
+from ..benchmarks.__main__ import measure, run
+
+
+#test synthetic corpus
+def test_corpus_reproducible():
+    assert generate_titles(200, seed=1) == generate_titles(200, seed=1)
+    assert generate_titles(200, seed=1) != generate_titles(200, seed=2)
+    assert generate_pairs(100, seed=1) == generate_pairs(100, seed=1)
+
+
+def test_corpus_features():
+    titles = generate_titles(2000)
+    assert any(" Series " in t for t in titles)
+    assert any("™" in t or "(TM)" in t for t in titles)
+    assert any("ō" in t or "ū" in t for t in titles)
+    assert any(t.endswith(" IV") or " IV:" in t for t in titles)
+
+
+def test_measure():
+    result = measure(lambda a: a, [(1,), (2,)], repeat=2, unit="titles")
+    assert result["calls"] == 4
+    assert result["unit"] == "titles"
+    assert result["p50_us"] <= result["p99_us"] <= result["max_us"]
+
+
+def test_run():
+    report = run(n_pairs=20, repeat=1)
+    assert report["corpus"] == {"pairs": 20, "seed": 0}
+    assert "cmp_titles" in report["results"]
@@ -0,0 +1,54 @@
+import json
+import pytest
+from click.testing import CliRunner
+from ..cli import cli, save_checkpoint
+
+RECORDS_A = [
+    {"id": 1, "titles": ["Resident Evil 2", "Biohazard 2"]},
+    {"id": 2, "titles": ["Final Fantasy VII"]},
+    {"id": 3, "titles": ["The Witcher III Wild Hunt"]},
+]
+
+RECORDS_B = [
+    {"id": "a", "titles": ["Resident Evil II"]},
+    {"id": "b", "titles": ["Final Fantasy 7", "FF 7"]},
+    {"id": "c", "titles": ["The Witcher 3: Wild Hunt"]},
+]
+
+
+@pytest.fixture
+def files(tmpdir):
+    for name, records in [("a.jsonl", RECORDS_A), ("b.jsonl", RECORDS_B)]:
+        tmpdir.join(name).write("\n".join(json.dumps(r) for r in records) + "\n")
+    return str(tmpdir.join("a.jsonl")), str(tmpdir.join("b.jsonl")), str(tmpdir.join("out.jsonl"))
+
+
+def _read_output(filepath):
+    with open(filepath) as f:
+        return [ json.loads(line) for line in f ]
+
+
+#test link command
+def test_link(files):
+    records_a, records_b, output = files
+    result = CliRunner().invoke(cli, ["link", records_a, records_b, output, "--chunk-size", "1", "--no-progress"])
+    assert result.exit_code == 0, result.output
+    matches = _read_output(output)
+    assert [ (m["id_a"], m["id_b"]) for m in matches ] == [(1, "a"), (2, "b"), (3, "c")]
+
+
+def test_link_resume(files, tmpdir):
+    records_a, records_b, output = files
+    first_match = json.dumps({"id_a": 1, "id_b": "a", "score": 1.0}) + "\n"
+    with open(output, "w") as f:
+        f.write(first_match + '{"id_a": 2, "id_')
+    checkpoint = output + ".checkpoint"
+    save_checkpoint(checkpoint, {
+        "records_a": records_a, "records_b": records_b, "threshold": 0.85,
+        "records": 1, "output_bytes": len(first_match)
+    })
+
+    result = CliRunner().invoke(cli, ["link", records_a, records_b, output, "--no-progress"])
+    assert result.exit_code == 0, result.output
+    assert [ (m["id_a"], m["id_b"]) for m in _read_output(output) ] == [(1, "a"), (2, "b"), (3, "c")]
+    assert not tmpdir.join("out.jsonl.checkpoint").exists()
@@ -0,0 +1,34 @@
+from ..cluster import cluster_titles, group_clusters, UnionFind
+
+TITLES = [
+    "Final Fantasy VII",
+    "Resident Evil 2",
+    "FINAL FANTASY 7",
+    "Final Fantasy VIII",
+    "Resident Evil II",
+    "Tetris",
+    "Final Fantasy VII™",
+]
+
+
+#test union find
+def test_union_find():
+    sets = UnionFind(5)
+    sets.union(0, 3)
+    sets.union(3, 4)
+    assert sets.find(4) == sets.find(0)
+    assert sets.find(1) != sets.find(0)
+
+
+#test title clustering
+def test_cluster_titles():
+    labels = cluster_titles(TITLES, threshold=0.85)
+    assert labels == [0, 1, 0, 3, 1, 5, 0]
+    assert group_clusters(TITLES, labels) == [
+        ["Final Fantasy VII", "FINAL FANTASY 7", "Final Fantasy VII™"],
+        ["Resident Evil 2", "Resident Evil II"],
+    ]
+
+
+def test_cluster_titles_empty():
+    assert cluster_titles([]) == []
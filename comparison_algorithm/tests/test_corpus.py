@@ -0,0 +1,100 @@
+import json
+import pytest
+from .. import corpus as corpus_module
+from ..corpus import build_corpus, load_corpus, TitleCorpus
+from ..comp import prepare_title
+from ..index import TitleIndex
+
+TITLES = [
+    "Final Fantasy VII",
+    "Final Fantasy X/X-2",
+    "FIFA 2015",
+    "Ōkami™",
+    "SIMPLE 1500 Series Vol. 1: The Mahjong",
+    "",
+]
+
+
+@pytest.fixture
+def title_list(tmpdir):
+    filepath = tmpdir.join("titles.json")
+    filepath.write(json.dumps(TITLES))
+    return str(filepath)
+
+
+#test corpus file
+def test_corpus_fields(tmpdir):
+    filepath = str(tmpdir.join("titles.corpus"))
+    build_corpus(TITLES, filepath)
+    with TitleCorpus(filepath) as corpus:
+        assert len(corpus) == len(TITLES)
+        assert corpus.titles() == TITLES
+        for i, title in enumerate(TITLES):
+            expected, prepared = prepare_title(title), corpus.prepared(i)
+            assert prepared.pre == expected.pre
+            assert prepared.std == expected.std
+            assert prepared.std_no_numbers == expected.std_no_numbers
+            assert prepared.numbers == expected.numbers
+
+
+def test_load_corpus_rebuilds_stale_file(tmpdir, title_list, monkeypatch):
+    filepath = str(tmpdir.join("titles.corpus"))
+    corpus = load_corpus(filepath, title_list)
+    assert not corpus.is_stale(title_list)
+    fingerprint = corpus.fingerprint
+    corpus.close()
+
+    monkeypatch.setattr(corpus_module, "REMOVE_SERIES", ["Other"])
+    corpus = load_corpus(filepath, title_list)
+    assert corpus.fingerprint != fingerprint
+    assert not corpus.is_stale(title_list)
+    corpus.close()
+
+
+def test_invalid_corpus_file(tmpdir):
+    filepath = tmpdir.join("invalid.corpus")
+    filepath.write_binary(b"\0" * 100)
+    with pytest.raises(ValueError):
+        TitleCorpus(str(filepath))
+    filepath.write_binary(b"GTCORPUS")
+    with pytest.raises(ValueError):
+        TitleCorpus(str(filepath))
+
+
+def test_title_index_from_corpus(tmpdir):
+    filepath = str(tmpdir.join("titles.corpus"))
+    build_corpus(TITLES, filepath)
+    with TitleCorpus(filepath) as corpus:
+        index = TitleIndex.from_corpus(corpus)
+    assert index.query("Final Fantasy 7", k=1) == [("Final Fantasy VII", 1.0)]
+
+
+def test_load_corpus_rebuilds_other_version(tmpdir, title_list):
+    filepath = tmpdir.join("titles.corpus")
+    load_corpus(str(filepath), title_list).close()
+    data = bytearray(filepath.read_binary())
+    #format version field follows the magic
+    data[8:10] = b"\0\0"
+    filepath.write_binary(bytes(data))
+    with pytest.raises(ValueError):
+        TitleCorpus(str(filepath))
+    with load_corpus(str(filepath), title_list) as corpus:
+        assert corpus.titles() == TITLES
+
+    filepath.write_binary(b"damaged")
+    with load_corpus(str(filepath), title_list) as corpus:
+        assert corpus.titles() == TITLES
+
+
+@pytest.mark.parametrize("end", [100, -1])
+def test_load_corpus_rebuilds_truncated_file(tmpdir, title_list, end):
+    filepath = tmpdir.join("titles.corpus")
+    load_corpus(str(filepath), title_list).close()
+    #cut in the offset sections or in the string blob
+    data = filepath.read_binary()
+    filepath.write_binary(data[:end])
+    with pytest.raises(ValueError):
+        TitleCorpus(str(filepath))
+    with load_corpus(str(filepath), title_list) as corpus:
+        assert corpus.titles() == TITLES
+        assert corpus.prepared_titles()[-2].std_no_numbers == prepare_title(TITLES[-2]).std_no_numbers
@@ -1,5 +1,8 @@
 import pytest
+import random
 from ..helpers import *
+from ..comp import _pre_processing, REMOVE_SERIES
+from ..benchmarks.normalization import std_chained, pre_processing_chained
 
 
 #remove_tm tests
@@ -45,4 +48,41 @@ def test_load_series():
     ]
     )
 def test_remove_numbers(test_input, expected_output):
-    assert remove_numbers(test_input) == expected_output
\ No newline at end of file
+    assert remove_numbers(test_input) == expected_output
+
+
+# test extracting numerals
+@pytest.mark.parametrize(
+    "test_input, expected_output",
+    [
+        ("Euro Fishing", []),
+        ("FIFA 2015", [("year", 15, "2015", "end", 5, 9)]),
+        ("Madden NFL 08", [("year", 8, "08", "end", 11, 13)]),
+        ("Eisenbahn 6.0 exe", [("number", 6.0, "6.0", "middle", 10, 13)]),
+        ("Call of Duty IV: Whatever", [("roman", 4.0, "IV", "middle", 13, 15)]),
+        ("2 Fast 2 Furious", [("number", 2.0, "2", "middle", 7, 8), ("number", 2.0, "2", "start", 0, 1)]),
+        ("Final Fantasy X/X-2", [
+            ("number", 2.0, "2", "end", 18, 19),
+            ("roman", 10.0, "X", "middle", 16, 17),
+            ("roman", 10.0, "X", "middle", 14, 15)
+        ]),
+    ]
+    )
+def test_extract_all_numbers(test_input, expected_output):
+    assert extract_all_numbers(test_input) == [ Numeral(*n) for n in expected_output ]
+
+
+# test normalization against the chained str.replace implementation
+def _random_titles(n, seed=0):
+    rnd = random.Random(seed)
+    parts = list("TheHEtuUoOōŌūŪnbm・ .:,-〔〕()'’*/!&?+ⅡIVX0123456789™®") + \
+        ["(TM)", "(R)", "The", "THE", "the", "ou", "Ou", "uu", "Uu", "nb", " Series"] + REMOVE_SERIES
+    return [ "".join(rnd.choice(parts) for _ in range(rnd.randint(0, 12))) for _ in range(n) ]
+
+def test_std_identical_to_chained():
+    for title in _random_titles(5000):
+        assert std(title) == std_chained(title)
+
+def test_pre_processing_identical_to_chained():
+    for title in _random_titles(5000, seed=1):
+        assert _pre_processing(title) == pre_processing_chained(title)
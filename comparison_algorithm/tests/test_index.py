@@ -0,0 +1,31 @@
+import pytest
+from ..index import TitleIndex
+from ..comp import cmp_titles
+
+TITLES = [
+    "Final Fantasy VII",
+    "Final Fantasy VIII",
+    "Final Fantasy X",
+    "Resident Evil 2",
+    "Resident Evil",
+    "Tetris",
+    "The Witcher 3: Wild Hunt",
+]
+
+#test top-k title search
+@pytest.mark.parametrize(
+    "query, k, min_score, expected_titles",
+    [
+        ("Final Fantasy 7", 1, 0.0, ["Final Fantasy VII"]),
+        ("Resident Evil II", 2, 0.0, ["Resident Evil 2", "Resident Evil"]),
+        ("Resident Evil II", 2, 0.9, ["Resident Evil 2"]),
+        ("The Witcher III: Wild Hunt", 10, 0.85, ["The Witcher 3: Wild Hunt"]),
+        ("Super Mario Bros.", 3, 0.5, []),
+    ]
+)
+def test_title_index_query(query, k, min_score, expected_titles):
+    index = TitleIndex(TITLES)
+    matches = index.query(query, k=k, min_score=min_score)
+    assert [ title for title, _ in matches ] == expected_titles
+    for title, score in matches:
+        assert score == cmp_titles([query], [title])
@@ -0,0 +1,28 @@
+from .. import instrumentation
+from ..comp import cmp_titles
+
+
+#test instrumentation of cmp_titles
+def test_instrument():
+    with instrumentation.instrument() as stats:
+        cmp_titles(["Resident Evil 2", "Biohazard 2"], ["Resident Evil", "RE"])
+        cmp_titles(["Final Fantasy VII"], ["Tetris"], score_cutoff=0.85)
+        snapshot = instrumentation.snapshot()
+    assert instrumentation.STATS is None
+    assert snapshot == stats.snapshot()
+    assert snapshot["calls"] == 2
+    assert snapshot["pairs"] == 5
+    assert snapshot["avg_pairs"] == 2.5
+    assert snapshot["skipped_pairs"] == 4
+    assert set(snapshot["stages"]) == {"preprocessing", "ratio", "rules"}
+    assert snapshot["stages"]["ratio"]["count"] == 5
+    assert set(snapshot["rules"]) == {"first_letter_rule", "numbering_rule"}
+    assert snapshot["stages"]["rules"]["count"] == 4
+    assert snapshot["rules"]["numbering_rule"]["count"] == 1
+    assert 0 <= snapshot["caches"]["prepare_title"]["hit_rate"] <= 1
+
+
+def test_disabled():
+    assert instrumentation.snapshot() is None
+    cmp_titles(["Resident Evil 2"], ["Resident Evil"])
+    assert instrumentation.STATS is None
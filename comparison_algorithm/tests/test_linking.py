@@ -1,7 +1,10 @@
 import pytest
 import Levenshtein as lev
-from ..comp import cmp_titles
+from ..comp import cmp_titles, prepare_title
 from ..helpers import std
+from ..linking import link_datasets, evaluate_blocking, qgrams
+from ..matrix import cmp_titles_matrix
+from ..parallel import link_datasets_parallel, chunks, imap_ordered
 from ..config import *
 
 #test linking by titles
@@ -44,4 +47,105 @@ from ..config import *
     ],    
 )
 def test_linking_by_titles(titles1, titles2, output):
-    assert cmp_titles(titles1, titles2) == output
\ No newline at end of file
+    assert cmp_titles(titles1, titles2) == output
+
+
+#test linking with prepared titles
+def test_linking_prepared_titles():
+    titles1 = ["Resident Evil 2", "Biohazard 2"]
+    titles2 = ["Resident Evil", "RE"]
+    prepared1 = [ prepare_title(t) for t in titles1 ]
+    assert cmp_titles(prepared1, titles2) == cmp_titles(titles1, titles2)
+    assert prepare_title("Resident Evil 2") is prepared1[0]
+
+
+
+RECORDS_A = [
+    (1, ["Resident Evil 2", "Biohazard 2"]),
+    (2, ["Final Fantasy VII"]),
+    (3, ["The Witcher III Wild Hunt"]),
+    (4, ["Tetris"]),
+]
+
+RECORDS_B = [
+    ("a", ["Resident Evil II"]),
+    ("b", ["Final Fantasy 7", "FF 7"]),
+    ("c", ["The Witcher 3: Wild Hunt"]),
+    ("d", ["Final Fantasy VIII"]),
+    ("e", ["Super Mario Bros."]),
+]
+
+#test blocked dataset linking
+def test_link_datasets():
+    matches = list(link_datasets(iter(RECORDS_A), RECORDS_B, threshold=0.85))
+    assert [ (a, b) for a, b, _ in matches ] == [(1, "a"), (2, "b"), (3, "c")]
+    assert all(score == 1 for _, _, score in matches)
+
+
+def test_link_datasets_parallel():
+    serial = list(link_datasets(RECORDS_A, RECORDS_B, threshold=0.5))
+    parallel = list(link_datasets_parallel(iter(RECORDS_A), RECORDS_B, threshold=0.5,
+                                           jobs=2, chunk_size=1))
+    assert parallel == serial
+
+
+def test_imap_ordered():
+    assert list(chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(imap_ordered(sum, chunks(iter(range(10)), 3), 2)) == [3, 12, 21, 9]
+
+
+def test_evaluate_blocking():
+    report = evaluate_blocking(RECORDS_A, RECORDS_B, threshold=0.85)
+    assert report["pairs"] == 20
+    assert report["true_matches"] == 3
+    assert report["recall"] == 1.0
+    assert report["candidates"] < report["pairs"]
+
+
+@pytest.mark.parametrize(
+    "test_input, expected_output",
+    [
+        ("", set()),
+        ("re", {"re"}),
+        ("tetris", {"tet", "etr", "tri", "ris"})
+    ]
+)
+def test_qgrams(test_input, expected_output):
+    assert qgrams(test_input, 3) == expected_output
+
+
+
+#test score matrix
+MATRIX_SETS = [
+    ["Resident Evil 2", "Biohazard 2"],
+    [],
+    ["Resident Evil", "RE"],
+    ["FIFA 2015"],
+    ["Fifa '16", "Fifa football 2016"],
+    ["FINAL FANTASY X"],
+    ["Final Fantasy 10"],
+    ["Left 4 Dead 2"],
+    ["Dark 2 Souls"],
+    ["Dark Souls"],
+    ["Title"],
+    ["Wrongtitle"],
+    ["(TM)"],
+]
+
+def test_cmp_titles_matrix():
+    scores = cmp_titles_matrix(MATRIX_SETS, MATRIX_SETS[::-1])
+    assert scores.shape == (len(MATRIX_SETS), len(MATRIX_SETS))
+    for i, a in enumerate(MATRIX_SETS):
+        for j, b in enumerate(MATRIX_SETS[::-1]):
+            assert scores[i, j] == cmp_titles(a, b)
+
+
+
+#test score cutoff
+@pytest.mark.parametrize("cutoff", [0, 0.5, 0.74, 0.85, 1])
+def test_linking_score_cutoff(cutoff):
+    for a in MATRIX_SETS:
+        for b in MATRIX_SETS:
+            score = cmp_titles(a, b)
+            expected = score if score >= cutoff else 0
+            assert cmp_titles(a, b, score_cutoff=cutoff) == expected
@@ -0,0 +1,60 @@
+import pytest
+from ..resolver import TitleResolver, title_key
+from ..comp import cmp_titles, prepare_title
+
+TITLES = [
+    "Final Fantasy VII",
+    "Final Fantasy VIII",
+    "Dark Souls II",
+    "Resident Evil 2",
+    "Resident Evil",
+    "Tetris",
+    "The Witcher 3: Wild Hunt",
+]
+
+
+#test normalized keys
+@pytest.mark.parametrize(
+    "a, b, equal",
+    [
+        ("Dark Souls II", "DARK SOULS 2", True),
+        ("Final Fantasy VII", "Final Fantasy 7", True),
+        ("Final Fantasy VII", "Final Fantasy VIII", False),
+        ("Tetris™", "tetris", True),
+        ("Resident Evil", "Resident Evil 2", False),
+    ]
+)
+def test_title_key(a, b, equal):
+    assert (title_key(a) == title_key(b)) == equal
+
+
+#test span resolution
+@pytest.mark.parametrize(
+    "span, expected",
+    [
+        ("DARK SOULS 2", "Dark Souls II"),
+        ("Final Fantasy 8", "Final Fantasy VIII"),
+        ("Witcher 3 - Wild Hunt", "The Witcher 3: Wild Hunt"),
+        ("Resident Evil II", "Resident Evil 2"),
+        ("Tetrs", "Tetris"),
+        ("Super Mario Bros.", None),
+    ]
+)
+def test_resolve(span, expected):
+    resolver = TitleResolver(TITLES)
+    match = resolver.resolve(span)
+    if expected is None:
+        assert match is None
+    else:
+        assert match == (expected, cmp_titles([span], [expected]))
+    assert resolver.resolve(prepare_title(span)) == match
+
+
+def test_resolve_key_only():
+    resolver = TitleResolver(TITLES)
+    assert resolver.resolve("DARK SOULS 2", fuzzy=False)[0] == "Dark Souls II"
+    assert resolver.resolve("Tetrs", fuzzy=False) is None
+    #the fuzzy index is only built on a miss
+    assert resolver._index is None
+    assert list(resolver.resolve_all(["Tetrs", "Doom"])) == [("Tetrs", "Tetris", cmp_titles(["Tetrs"], ["Tetris"])),
+                                                          ("Doom", None, None)]
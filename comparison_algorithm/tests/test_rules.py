@@ -1,6 +1,7 @@
 import pytest
 from ..rules import *
 from ..config import *
+from ..helpers import PreparedTitle
 
 # FIRST LETTER RULE TESTS
 @pytest.mark.parametrize(
@@ -41,4 +42,69 @@ def test_first_letter_rule(test_a, test_b, output):
     ]
 )
 def test_numbering_rule(test_a, test_b, output):
-    assert numbering_rule(test_a,test_b) == output
\ No newline at end of file
+    assert numbering_rule(test_a,test_b) == output
+
+
+@pytest.mark.parametrize(
+    "test_a, test_b",
+    [
+        ("Fifa 2014", "Fifa 2015"),
+        ("THE WITCHER III WILD HUNT", "The Witcher 3: Wild Hunt"),
+        ("Eisenbahn 6.0 exe", "Eisenbahn 6"),
+        ("Title", "Wrongtitle")
+    ]
+)
+def test_rules_prepared_titles(test_a, test_b):
+    prep_a, prep_b = PreparedTitle(test_a), PreparedTitle(test_b)
+    assert numbering_rule(prep_a, prep_b) == numbering_rule(test_a, test_b)
+    assert first_letter_rule(prep_a, prep_b) == first_letter_rule(test_a, test_b)
+
+
+
+# RULE ENGINE TESTS
+def test_rule_declarations():
+    assert first_letter_rule.max_penalty == FIRST_LETTER_WEIGHT
+    assert numbering_rule.max_penalty == NUMBERING_WEIGHT
+    assert first_letter_rule.cost < numbering_rule.cost
+    assert numbering_rule.__name__ == "numbering_rule"
+
+
+def test_rule_engine_order():
+    engine = RuleEngine([numbering_rule, first_letter_rule])
+    assert engine.lazy
+    assert engine.rules == [first_letter_rule, numbering_rule]
+    assert engine.max_penalty == NUMBERING_WEIGHT + FIRST_LETTER_WEIGHT
+
+
+@pytest.mark.parametrize(
+    "ratio, best_ratio, score_cutoff, output",
+    [
+        (1.0, 0, None, NUMBERING_WEIGHT),
+        (1.0, 0.8, None, None),
+        (1.0, 0, 0.8, None),
+        (0.5, 0.5, None, None),
+        (1.0, 0.5, 0.74, NUMBERING_WEIGHT),
+    ]
+)
+def test_rule_engine_penalty(ratio, best_ratio, score_cutoff, output):
+    a, b = PreparedTitle("The Witcher II"), PreparedTitle("The Witcher")
+    engine = get_engine([first_letter_rule, numbering_rule])
+    assert engine.penalty(a, b, ratio, best_ratio, score_cutoff) == output
+
+
+def test_custom_rules():
+    calls = []
+    def plain_rule(a, b):
+        calls.append((a, b))
+        return 0.1
+
+    @rule(max_penalty=0.5, cost=0)
+    def custom_rule(a, b):
+        return 0.5 if a.pre.lower() != b.pre.lower() else 0
+
+    a, b = PreparedTitle("Title"), PreparedTitle("title")
+    assert not RuleEngine([plain_rule, numbering_rule]).lazy
+    assert RuleEngine([plain_rule]).penalty(a, b, 0.0) == 0.1
+    assert calls == [(a, b)]
+    assert RuleEngine([custom_rule, numbering_rule]).rules[0] is custom_rule
+    assert RuleEngine([custom_rule]).penalty(a, b, 1.0) == 0
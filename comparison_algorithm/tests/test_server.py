@@ -0,0 +1,108 @@
+import asyncio
+import json
+from ..server import ComparisonServer, _process_batch
+from ..comp import cmp_titles
+
+TITLES = ["Final Fantasy VII", "Final Fantasy VIII", "Resident Evil 2", "Tetris"]
+
+
+#test batch processing
+def test_process_batch():
+    responses = _process_batch([
+        {"id": 1, "op": "cmp", "titles_a": ["Resident Evil 2"], "titles_b": ["Resident Evil II"]},
+        {"id": 2, "op": "unknown"},
+    ])
+    assert responses[0] == {"id": 1, "result": 1.0}
+    assert responses[1]["id"] == 2
+    assert "unknown op" in responses[1]["error"]
+
+
+#test server over unix socket
+def test_server(tmpdir):
+    title_list = tmpdir.join("titles.json")
+    title_list.write(json.dumps(TITLES))
+    socket_path = str(tmpdir.join("server.sock"))
+    requests = [
+        {"id": i, "op": "cmp", "titles_a": [a], "titles_b": [b]}
+        for i, (a, b) in enumerate([("Resident Evil 2", "Resident Evil"), ("Tetris", "Tetris"), ("FIFA 2015", "Fifa '16")])
+    ]
+    requests.append({"id": "q", "op": "query", "title": "Final Fantasy 7", "k": 1})
+
+    async def run():
+        server = ComparisonServer(str(title_list), jobs=0, max_batch_size=2, max_wait=0.05)
+        await server.start(path=socket_path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b"\n")
+            writer.write(b"not json\n")
+            await writer.drain()
+            responses = [ json.loads(await reader.readline()) for _ in range(len(requests) + 1) ]
+            writer.close()
+        finally:
+            await server.close()
+        return responses
+
+    responses = asyncio.run(run())
+    by_id = { r["id"]: r for r in responses }
+    for request in requests[:3]:
+        assert by_id[request["id"]]["result"] == cmp_titles(request["titles_a"], request["titles_b"])
+    assert by_id["q"]["result"] == [["Final Fantasy VII", 1.0]]
+    assert "invalid request" in by_id[None]["error"]
+
+
+#test that a non-object request line does not block the other requests of its batch
+def test_server_non_object_request(tmpdir):
+    socket_path = str(tmpdir.join("server.sock"))
+    lines = [b"[1,2]", b'"x"', json.dumps({"id": 1, "op": "cmp", "titles_a": ["Tetris"], "titles_b": ["Tetris"]}).encode()]
+
+    async def run():
+        server = ComparisonServer(jobs=0, max_batch_size=8, max_wait=0.05)
+        await server.start(path=socket_path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            for line in lines:
+                writer.write(line + b"\n")
+            await writer.drain()
+            responses = [ json.loads(await asyncio.wait_for(reader.readline(), 10)) for _ in lines ]
+            writer.close()
+        finally:
+            await server.close()
+        return responses
+
+    responses = asyncio.run(run())
+    assert [ r for r in responses if r["id"] == 1 ] == [{"id": 1, "result": 1.0}]
+    errors = [ r["error"] for r in responses if r["id"] is None ]
+    assert len(errors) == 2 and all( "not a JSON object" in e for e in errors )
+
+
+#test that a failing batch still resolves all of its requests
+def test_run_batch_failure():
+    async def run():
+        server = ComparisonServer(jobs=0)
+        loop = asyncio.get_running_loop()
+        batch = [ ({"id": i}, loop.create_future()) for i in range(3) ]
+        server.executor.shutdown()
+        await server._run_batch(batch)
+        return [ future.result() for _, future in batch ]
+
+    responses = asyncio.run(run())
+    assert [ r["id"] for r in responses ] == [0, 1, 2]
+    assert all( "RuntimeError" in r["error"] for r in responses )
+
+
+#test that batches in flight are tracked and finished on close
+def test_close_waits_for_batches():
+    async def run():
+        server = ComparisonServer(jobs=0, max_wait=0)
+        server.queue = asyncio.Queue()
+        server._batcher = asyncio.ensure_future(server._collect_batches())
+        request = {"id": 1, "op": "cmp", "titles_a": ["Tetris"], "titles_b": ["Tetris"]}
+        response = asyncio.ensure_future(server.submit(request))
+        while not server._batch_tasks:
+            await asyncio.sleep(0)
+        await server.close()
+        assert not server._batch_tasks
+        return await response
+
+    assert asyncio.run(run()) == {"id": 1, "result": 1.0}
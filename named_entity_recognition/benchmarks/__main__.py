@@ -0,0 +1,58 @@
+"""
+Throughput and quality benchmark of the title matchers on synthetic documents.
+
+Every matcher runs in its own process, which reports startup time, characters and
+documents per second, peak memory (max RSS) and precision/recall of the found spans.
+
+$ python -m named_entity_recognition.benchmarks --docs 2000 --output results.json
+$ python -m named_entity_recognition.benchmarks --docs 2000 --compare results.json
+"""
+
+import json
+import click
+from .matchers import MATCHERS, run
+
+
+def print_results(report, baseline=None):
+    header = "{0:<20}{1:>10}{2:>14}{3:>10}{4:>10}{5:>11}{6:>8}".format(
+        "matcher", "startup s", "chars/s", "docs/s", "peak MB", "precision", "recall")
+    if baseline:
+        header += "{0:>10}".format("speedup")
+    print(header)
+    for name, r in report["results"].items():
+        if "error" in r:
+            print("{0:<20}{1}".format(name, r["error"]))
+            continue
+        line = "{0:<20}{1:>10.2f}{2:>14.0f}{3:>10.1f}{4:>10.1f}{5:>11.3f}{6:>8.3f}".format(
+            name, r["startup_s"], r["chars_per_second"], r["docs_per_second"],
+            r["peak_rss_mb"], r["precision"], r["recall"])
+        base = baseline["results"].get(name, {}) if baseline else {}
+        if "chars_per_second" in base:
+            line += "{0:>9.2f}x".format(r["chars_per_second"] / base["chars_per_second"])
+        print(line)
+
+
+@click.command()
+@click.option("--docs", "-n", default=1000, show_default=True, help="number of synthetic documents")
+@click.option("--titles", default=20000, show_default=True, help="number of synthetic dictionary titles")
+@click.option("--title-dict", type=click.Path(exists=True, dir_okay=False), help="JSON title list instead of synthetic titles")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--matcher", "-m", "matchers", multiple=True, type=click.Choice(list(MATCHERS)),
+              help="matchers to run (default: all)")
+@click.option("--isolate/--no-isolate", default=True, show_default=True, help="run every matcher in its own process")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="write results as JSON")
+@click.option("--compare", "-c", type=click.Path(exists=True, dir_okay=False), help="JSON results of a previous run")
+def main(docs, titles, title_dict, seed, matchers, isolate, output, compare):
+    report = run(docs, titles, seed, list(matchers or MATCHERS), title_dict, isolate)
+    baseline = None
+    if compare:
+        with open(compare) as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Reproducible synthetic documents with embedded game titles for NER benchmarks.
+Documents consist of sentences of filler words; some sentences mention a title of
+the dictionary, some a title missing from it. The character spans of all embedded
+titles are kept as gold standard.
+"""
+
+import random
+from comparison_algorithm.benchmarks.corpus import generate_titles
+
+#lowercase filler words, none of them a word of the synthetic titles
+FILLER = [
+    "i", "really", "liked", "playing", "it", "yesterday", "with", "my", "friends", "but",
+    "ending", "was", "too", "short", "and", "boss", "fights", "felt", "unfair", "after",
+    "patch", "controls", "are", "fine", "on", "a", "controller", "graphics", "look", "great",
+    "for", "its", "age", "still", "prefer", "original", "version", "anyone", "know", "if",
+]
+TEMPLATES = [
+    "{0} {1}.",
+    "{0} {1} {2}!",
+    "{0} ({1}), {2}.",
+    "{1}: {0}.",
+]
+
+
+def _filler(rnd, n):
+    return " ".join( rnd.choice(FILLER) for _ in range(n) )
+
+
+def generate_documents(titles, n_docs, seed=0, sentences=(3, 8), title_ratio=0.5, unknown_ratio=0.2):
+    """
+    returns a list of :n_docs: documents (text, list of (start, end) spans of the embedded titles,
+    end exclusive), reproducible for the same :seed:. :title_ratio: of the sentences mention a title,
+    :unknown_ratio: of them a synthetic title which is not in list :titles:.
+    """
+    rnd = random.Random(seed)
+    known = set(titles)
+    unknown = [ t for t in generate_titles(max(100, n_docs), seed + 1) if t not in known ]
+    documents = []
+    for _ in range(n_docs):
+        text = ""
+        spans = []
+        for _ in range(rnd.randint(*sentences)):
+            if text:
+                text += " "
+            if rnd.random() >= title_ratio:
+                text += _filler(rnd, rnd.randint(4, 12)).capitalize() + "."
+                continue
+            title = rnd.choice(unknown if unknown and rnd.random() < unknown_ratio else titles)
+            before, after = _filler(rnd, rnd.randint(1, 6)), _filler(rnd, rnd.randint(1, 6))
+            template = rnd.choice(TEMPLATES)
+            sentence = template.format(before.capitalize(), "\0", after)
+            start = len(text) + sentence.index("\0")
+            text += sentence.replace("\0", title)
+            spans.append((start, start + len(title)))
+        documents.append((text, spans))
+    return documents
+
+
+def evaluate(documents, predicted):
+    """
+    returns precision and recall of :predicted: spans (list of (start, end) per document)
+    against the gold spans of :documents:
+    """
+    found = gold = correct = 0
+    for (_, spans), predicted_spans in zip(documents, predicted):
+        predicted_spans = set(predicted_spans)
+        found += len(predicted_spans)
+        gold += len(spans)
+        correct += len(predicted_spans & set(spans))
+    return {
+        "precision": correct / found if found else 0.0,
+        "recall": correct / gold if gold else 0.0,
+    }
@@ -0,0 +1,145 @@
+"""
+Title matchers of the NER benchmark and their measurement.
+
+Every matcher can run in its own (spawned) process, which reports startup time, characters
+and documents per second, peak memory (max RSS) and precision/recall of the found spans.
+"""
+
+import json
+import os
+import platform
+import resource
+import tempfile
+from collections import defaultdict
+from multiprocessing import get_context
+from time import perf_counter
+from comparison_algorithm.benchmarks.corpus import generate_titles
+from .. import model_matcher
+from ..dict_matcher import TitleDictMatcher, compile_matcher
+from ..fuzzy_matcher import FuzzyTitleMatcher
+from ..hybrid_matcher import TitleHybridMatcher
+from ..title_store import TitleStore, build_store
+from .documents import generate_documents, evaluate
+
+MODEL = os.path.join(os.path.dirname(model_matcher.__file__), model_matcher.TITLE_MODEL)
+
+
+def _dict_spans(matcher, texts):
+    return [ [ (start, end+1) for _, start, end in matcher.match(text) ] for text in texts ]
+
+
+def _fuzzy_spans(matcher, texts):
+    return [ [ (start, end+1) for _, start, end, _ in matcher(text) ] for text in texts ]
+
+
+def _model_spans(matcher, texts):
+    spans = defaultdict(list)
+    for doc_id, _, start, end, _ in matcher.pipe(texts):
+        spans[doc_id].append((start, end))
+    return [ spans[i] for i in range(len(texts)) ]
+
+
+def _hybrid_spans(matcher, texts):
+    return [ [ (start, end) for _, start, end, _ in matcher(text) ] for text in texts ]
+
+
+def _model():
+    matcher = model_matcher.TitleModelMatcher(MODEL)
+    #load the model as part of the startup
+    matcher.nlp
+    return matcher
+
+
+def _dict_cold(files):
+    #no matcher file yet, so the titles are compiled and the matcher file is written
+    if os.path.exists(files["cold"]):
+        os.remove(files["cold"])
+    return TitleDictMatcher(title_dict=files["titles"], compiled=files["cold"])
+
+
+def _dict_warm(files):
+    return TitleDictMatcher(title_dict=files["titles"], compiled=files["compiled"])
+
+
+#matcher name: (function returning the matcher for (titles, benchmark files), function returning the spans of a list of texts)
+#benchmark files: JSON title list "titles", title store "store", compiled matcher "compiled", missing matcher file "cold"
+MATCHERS = {
+    "dict (cold start)": (lambda titles, files: _dict_cold(files), _dict_spans),
+    "dict (warm start)": (lambda titles, files: _dict_warm(files), _dict_spans),
+    "dict (title store)": (lambda titles, files: TitleDictMatcher(store=TitleStore(files["store"])), _dict_spans),
+    "fuzzy": (lambda titles, files: FuzzyTitleMatcher(titles), _fuzzy_spans),
+    "model": (lambda titles, files: _model(), _model_spans),
+    "hybrid": (lambda titles, files: TitleHybridMatcher(_dict_warm(files), _model()), _hybrid_spans),
+}
+
+
+def _max_rss_mb():
+    """ returns the peak resident set size of this process in MB (ru_maxrss is in KB on Linux) """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_matcher(name, titles, files, documents):
+    """
+    builds matcher :name: and runs it on :documents:, returns its startup time,
+    throughput, peak memory and precision/recall
+    """
+    build, spans = MATCHERS[name]
+    rss_before = _max_rss_mb()
+    start = perf_counter()
+    try:
+        matcher = build(titles, files)
+    except ImportError as e:
+        return {"error": str(e)}
+    startup = perf_counter() - start
+
+    texts = [ text for text, _ in documents ]
+    start = perf_counter()
+    predicted = spans(matcher, texts)
+    elapsed = perf_counter() - start
+
+    result = {
+        "startup_s": startup,
+        "chars_per_second": sum(map(len, texts)) / elapsed if elapsed else float("inf"),
+        "docs_per_second": len(texts) / elapsed if elapsed else float("inf"),
+        "peak_rss_mb": _max_rss_mb(),
+        "rss_increase_mb": _max_rss_mb() - rss_before,
+    }
+    result.update(evaluate(documents, predicted))
+    return result
+
+
+def run(n_docs=1000, n_titles=20000, seed=0, matchers=list(MATCHERS), title_dict=None, isolate=True):
+    """
+    runs :matchers: on :n_docs: synthetic documents mentioning titles of
+    :title_dict: (JSON title list, default: :n_titles: synthetic titles) and returns the results.
+    With :isolate: every matcher runs in a new process, so peak memory is measured per matcher.
+    """
+    if title_dict is not None:
+        with open(title_dict) as f:
+            titles = json.load(f)
+    else:
+        titles = generate_titles(n_titles, seed)
+    documents = generate_documents(titles, n_docs, seed)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = { name: os.path.join(tmpdir, filename) for name, filename in
+                  [("titles", "titles.json"), ("store", "titles.store"), ("compiled", "titles.matcher"), ("cold", "cold.matcher")] }
+        with open(files["titles"], "w") as f:
+            json.dump(titles, f)
+        build_store(titles, files["store"], source=files["titles"])
+        compile_matcher(files["titles"], files["compiled"])
+        for name in matchers:
+            if isolate:
+                with get_context("spawn").Pool(1) as pool:
+                    results[name] = pool.apply(measure_matcher, (name, titles, files, documents))
+            else:
+                results[name] = measure_matcher(name, titles, files, documents)
+
+    return {
+        "corpus": {"docs": n_docs, "chars": sum( len(text) for text, _ in documents ),
+                   "titles": title_dict or n_titles, "seed": seed},
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results
+    }
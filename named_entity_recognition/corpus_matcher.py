@@ -0,0 +1,131 @@
+"""
+Dictionary title matching over large text files.
+
+The file is memory-mapped and matched in windows. Every window is extended by an overlap
+larger than the longest title on both sides, so matches crossing a window border and the
+boundary characters around them are seen completely. Each match is emitted once, by the
+window its start byte belongs to, with absolute byte offsets in the file.
+
+$ python -m named_entity_recognition.corpus_matcher dump.txt -o matches.jsonl
+"""
+
+import json
+import mmap
+import os
+import click
+from tqdm import tqdm
+from .dict_matcher import TitleDictMatcher, TITLE_DICT
+from .title_store import load_store
+
+#bytes matched per window
+WINDOW_SIZE = 1 << 20
+
+
+def _char_start(data, pos):
+    """ returns :pos: moved back to the first byte of the utf-8 character at :pos: """
+    while 0 < pos < len(data) and data[pos] & 0xC0 == 0x80:
+        pos -= 1
+    return pos
+
+
+def _suppress_contained(matches):
+    """
+    removes matches (rank, title, start, end) lying within the span of a longer match,
+    returns the remaining matches sorted by start position
+    """
+    matches = sorted(matches, key=lambda x: (x[2], -x[3], x[0]))
+    kept = []
+    max_span = (-1, -1)
+    for match in matches:
+        span = (match[2], match[3])
+        if span[1] <= max_span[1] and span != max_span:
+            continue
+        kept.append(match)
+        if span[1] > max_span[1]:
+            max_span = span
+    return kept
+
+
+def _match_window(automaton, data, offset, core_start, core_end):
+    """
+    yields (title, start byte, end byte) of all matches in bytes :data: (starting at file offset :offset:)
+    which start in [:core_start:, :core_end:)
+    """
+    #undecodable bytes become one surrogate character each, so byte offsets can be recovered
+    text = data.decode("utf-8", errors="surrogateescape")
+    l_text = text.lower()
+    if len(l_text) != len(text):
+        l_text = "".join( c.lower() if len(c.lower()) == 1 else c for c in text )
+    ascii = data.isascii()
+
+    char_pos, byte_pos = 0, offset
+    for _, title, start, end in _suppress_contained(automaton.find_all(l_text)):
+        if ascii:
+            start_byte, end_byte = offset + start, offset + end
+        else:
+            byte_pos += len(text[char_pos:start].encode("utf-8", errors="surrogateescape"))
+            char_pos = start
+            start_byte = byte_pos
+            end_byte = byte_pos + len(text[start:end+1].encode("utf-8", errors="surrogateescape")) - 1
+        if start_byte >= core_end:
+            break
+        if start_byte >= core_start:
+            yield (title, start_byte, end_byte)
+
+
+def match_file(filepath, matcher=None, window_size=WINDOW_SIZE, progress=None):
+    """
+    Memory-maps utf-8 text file :filepath: and yields (title, start byte, end byte) of all titles
+    found by :matcher: (default: TitleDictMatcher()), sorted by start byte. End bytes are inclusive.
+
+    Unlike TitleDictMatcher.__call__, only matches lying within a longer match are suppressed,
+    so the result does not depend on the window size.
+    :progress: function called with the number of bytes of every finished window
+    """
+    matcher = matcher or TitleDictMatcher()
+    automaton = matcher.automaton
+    #utf-8 characters have up to 4 bytes; one more character for the boundary check
+    overlap = 4 * (automaton.max_title_length + 1)
+
+    with open(filepath, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        for window_start in range(0, size, window_size):
+            core_start = _char_start(data, window_start)
+            core_end = _char_start(data, min(window_start + window_size, size))
+            start = _char_start(data, max(0, core_start - overlap))
+            end = _char_start(data, min(core_end + overlap, size))
+            yield from _match_window(automaton, data[start:end], start, core_start, core_end)
+            if progress is not None:
+                progress(core_end - core_start)
+    finally:
+        data.close()
+
+
+@click.command()
+@click.argument("corpus", type=click.Path(exists=True, dir_okay=False))
+@click.option("--output", "-o", type=click.File("w"), default="-", help="JSON Lines output file (default: stdout)")
+@click.option("--title-dict", default=TITLE_DICT, show_default=True, help="JSON title list")
+@click.option("--store", type=click.Path(dir_okay=False), default=None, help="title store file, built from --title-dict if missing")
+@click.option("--window-size", default=WINDOW_SIZE, show_default=True, help="bytes matched per window")
+@click.option("--progress/--no-progress", default=True)
+def match_corpus(corpus, output, title_dict, store, window_size, progress):
+    """
+    Matches the dictionary titles in text file CORPUS and writes one JSON object
+    {"title", "start", "end"} (byte offsets, end inclusive) per match.
+    """
+    if store is not None:
+        matcher = TitleDictMatcher(store=load_store(store, title_dict))
+    else:
+        matcher = TitleDictMatcher(title_dict=title_dict)
+
+    with tqdm(total=os.path.getsize(corpus), unit="B", unit_scale=True, disable=not progress) as bar:
+        for title, start, end in match_file(corpus, matcher, window_size, bar.update):
+            output.write(json.dumps({"title": title, "start": start, "end": end}) + "\n")
+
+
+if __name__ == "__main__":
+    match_corpus()
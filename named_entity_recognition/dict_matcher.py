@@ -1,8 +1,23 @@
 import json
 import string
 import re
+import os
+import pickle
+import hashlib
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool, cpu_count
 
 TITLE_DICT = "dict/game_titles.json"
+#compiled matcher of TITLE_DICT, rebuilt when the checksum of TITLE_DICT changes
+TITLE_MATCHER = "dict/game_titles.matcher"
+MATCHER_VERSION = 2
+#number of documents matched per batch in TitleDictMatcher.pipe
+PIPE_BATCH_SIZE = 1000
+
+#characters allowed before and after a matched title
+BOUNDARY_CHARS = frozenset(string.punctuation+" ")
 
 TEXT = """
 Spyro: year of the dragon Spyro Reignited Trilogy is coming to PlayStation 4 
@@ -12,47 +27,229 @@ in remastered form. Those three games were original developed by Insomniac Games
 Ratchet and Clank and is developing this year’s Spider-Man for PS4."""
 
 
+class TitleAutomaton(object):
+    """
+    Matcher built once over the lowercased dictionary :game_titles:.
+
+    Titles can only start after and end before a boundary character (punctuation, blank),
+    so the text is scanned once from every start boundary along the following end
+    boundaries, looking up the substrings in a hash table of titles. The scan from a
+    start position stops as soon as the substring is no prefix (up to a boundary) of any title.
+    """
+
+    def __init__(self, game_titles):
+        self.titles = {}
+        self.prefixes = set()
+        self.max_title_length = 0
+        for rank, title in enumerate(sorted(game_titles, key=lambda x: -len(x))):
+            l_title = title.lower()
+            if not l_title:
+                continue
+            self.titles.setdefault(l_title, []).append((rank, title))
+            self.max_title_length = max(self.max_title_length, len(title))
+            for i in range(1, len(l_title)):
+                if l_title[i] in BOUNDARY_CHARS:
+                    self.prefixes.add(l_title[:i])
+
+    def find_all(self, l_text):
+        """
+        returns all matches (rank, title, start, end) in lowercased text :l_text:,
+        sorted by rank (longest titles first) and start position
+        """
+        titles, prefixes = self.titles, self.prefixes
+        boundaries = [ i for i, c in enumerate(l_text) if c in BOUNDARY_CHARS ]
+        ends = boundaries + [len(l_text)]
+        matches = []
+        for start in [0] + [ i+1 for i in boundaries ]:
+            #index loop instead of a list slice, which would copy the remaining ends for every start
+            for k in range(bisect_right(ends, start), len(ends)):
+                end = ends[k]
+                sub = l_text[start:end]
+                for rank, title in titles.get(sub, ()):
+                    matches.append((rank, title, start, end-1))
+                if sub not in prefixes:
+                    break
+        matches.sort()
+        return matches
+
+    @property
+    def game_titles(self):
+        """ all dictionary titles, longest first """
+        ranked = [ t for hits in self.titles.values() for t in hits ]
+        return [ title for _, title in sorted(ranked) ]
+
+    def __getstate__(self):
+        return {"titles": self.titles, "prefixes": self.prefixes, "max_title_length": self.max_title_length}
+
+    def __setstate__(self, state):
+        self.titles = state["titles"]
+        self.prefixes = state["prefixes"]
+        self.max_title_length = state["max_title_length"]
+
+
+def chunks(items, chunk_size):
+    """ yields lists of :chunk_size: items """
+    items = iter(items)
+    chunk = list(islice(items, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, chunk_size))
+
+
+def imap_ordered(func, chunk_iter, jobs, initializer=None, initargs=()):
+    """
+    calls :func:(chunk) for every chunk of iterable :chunk_iter: in a pool of :jobs: processes
+    (started with :initializer:(*:initargs:)) and yields the results in input order.
+    At most 2 * :jobs: chunks are in flight at a time, so :chunk_iter: is consumed lazily.
+    """
+    with Pool(jobs, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for chunk in chunk_iter:
+            pending.append(pool.apply_async(func, (chunk,)))
+            if len(pending) >= 2*jobs:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def file_checksum(filepath):
+    """ returns the sha1 checksum of file :filepath: """
+    h = hashlib.sha1()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def compile_matcher(title_dict=TITLE_DICT, filepath=TITLE_MATCHER):
+    """
+    builds the TitleAutomaton of JSON title list :title_dict:, saves it to :filepath:
+    together with the checksum of :title_dict: and returns it
+    """
+    checksum = file_checksum(title_dict)
+    with open(title_dict) as f:
+        automaton = TitleAutomaton(json.load(f))
+    tmp_filepath = "{0}.{1}.tmp".format(filepath, os.getpid())
+    with open(tmp_filepath, "wb") as f:
+        #only builtin types are pickled, so the file does not depend on the module path
+        pickle.dump({
+            "version": MATCHER_VERSION,
+            "checksum": checksum,
+            "automaton": automaton.__getstate__()
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_filepath, filepath)
+    return automaton
+
+
+def load_matcher(title_dict=TITLE_DICT, filepath=TITLE_MATCHER):
+    """
+    loads the compiled TitleAutomaton from :filepath:,
+    (re)compiles it if it is missing, outdated, damaged or :title_dict: has changed
+    """
+    if os.path.isfile(filepath):
+        try:
+            with open(filepath, "rb") as f:
+                compiled = pickle.load(f)
+            if compiled.get("version") == MATCHER_VERSION and compiled.get("checksum") == file_checksum(title_dict):
+                automaton = TitleAutomaton.__new__(TitleAutomaton)
+                automaton.__setstate__(compiled["automaton"])
+                return automaton
+        except Exception:
+            #truncated or corrupt matcher file, e.g. from an interrupted write
+            pass
+    return compile_matcher(title_dict, filepath)
+
+
 class TitleDictMatcher(object):
 
-    def __init__(self):
+    def __init__(self, game_titles=None, title_dict=TITLE_DICT, compiled=TITLE_MATCHER, store=None):
+        """
+        Matches list of :game_titles:, or the titles of JSON file :title_dict:
+        using its :compiled: matcher file (None: do not use a matcher file),
+        or the titles of memory-mapped TitleStore :store: (see title_store.py)
+        """
         self.found_titles = []
-        with open(TITLE_DICT) as f:
-            self.game_titles = json.load(f)
+        if store is not None:
+            self.automaton = store
+        elif game_titles is not None:
+            self.automaton = TitleAutomaton(game_titles)
+        elif compiled is not None:
+            self.automaton = load_matcher(title_dict, compiled)
+        else:
+            with open(title_dict) as f:
+                self.automaton = TitleAutomaton(json.load(f))
+
+    @property
+    def game_titles(self):
+        return self.automaton.game_titles
 
-    def _contains(self, title):
-        for found_title in self.found_titles:
-            if title in found_title and title != found_title:
-                return True
-        return False
+    def match(self, text):
+        """
+        returns list of (title, start index, end index) of all titles found in :text:
+        Titles contained in a longer found title are suppressed. Does not change the matcher,
+        so one instance can be shared between threads.
+        """
+        matches = []
+        found_titles = []
+        for _, title, start_index, end_index in self.automaton.find_all(text.lower()):
+            if not _contains(found_titles, title):
+                matches.append((title, start_index, end_index))
+                found_titles.append(title)
+        return matches
 
     def __call__(self, text):
         self.found_titles = []
-        for title in sorted(self.game_titles, key=lambda x: -len(x)):
+        for match in self.match(text):
+            self.found_titles.append(match[0])
+            yield match
 
-            l_text = text.lower()
-            l_title = title.lower()
+    def pipe(self, texts, batch_size=PIPE_BATCH_SIZE, n_process=1, as_tuples=False):
+        """
+        Matches a stream of documents and yields (doc id, title, start index, end index)
+        in input order. The doc id is the position of the document in :texts:, or the first
+        value of each (doc id, text) tuple in :texts: with :as_tuples:.
+
+        :batch_size: number of documents sent to a worker at once
+        :n_process:  number of worker processes (-1: number of CPUs). Workers inherit the loaded
+                     dictionary (copy-on-write with the fork start method);
+                     at most 2 * :n_process: batches are in flight at a time.
+        """
+        if n_process == -1:
+            n_process = cpu_count()
+        if not as_tuples:
+            texts = enumerate(texts)
+
+        if n_process == 1:
+            for batch in chunks(texts, batch_size):
+                yield from _match_batch(batch, self)
+            return
+
+        for matches in imap_ordered(_match_batch, chunks(texts, batch_size), n_process, _init_worker, (self,)):
+            yield from matches
+
+
+def _contains(found_titles, title):
+    for found_title in found_titles:
+        if title in found_title and title != found_title:
+            return True
+    return False
 
-            start_index = l_text.find(l_title)
-            while start_index >= 0:
 
-                if start_index == 0:
-                    prior_char = " "
-                else:
-                    prior_char = l_text[start_index-1]
+#WORKER STATE
+_MATCHER = None
 
-                end_index = start_index+len(l_title)-1
-                if end_index == len(l_text)-1:
-                    after_char = " "
-                else:
-                    after_char = l_text[end_index+1]
 
-                if prior_char in string.punctuation+" " and after_char in string.punctuation+" ":
+def _init_worker(matcher):
+    global _MATCHER
+    _MATCHER = matcher
 
-                    if not self._contains(title):
-                        yield(title, start_index, end_index)
-                        self.found_titles.append(title)
 
-                start_index = l_text.find(l_title, end_index+1)        
+def _match_batch(batch, matcher=None):
+    """ returns list of (doc id, title, start, end) for all (doc id, text) in :batch: """
+    matcher = matcher or _MATCHER
+    return [ (doc_id, title, start, end)
+             for doc_id, text in batch
+             for title, start, end in matcher.match(text) ]
 
 
 def test(text=TEXT):
@@ -0,0 +1,135 @@
+"""
+Fuzzy dictionary title matcher for misspelled titles in text.
+
+Titles are indexed by the deletion neighbourhood (SymSpell) of the prefix of their
+standardized form without numerals: every string derived by deleting up to :max_distance: characters.
+Candidate spans of the text look up their own deletions, so the candidates within
+edit distance :max_distance: are found without scanning the dictionary; they are
+verified by edit distance and cmp_titles.
+"""
+
+import json
+import re
+import Levenshtein as lev
+from comparison_algorithm.comp import cmp_titles, ALL_RULES
+from comparison_algorithm.resolver import title_key
+from .dict_matcher import TITLE_DICT
+
+MAX_DISTANCE = 2
+#only the first PREFIX_LENGTH characters of a standardized title are indexed
+PREFIX_LENGTH = 7
+#titles with shorter standardized forms only match exactly
+MIN_FUZZY_LENGTH = 6
+MIN_SCORE = 0.85
+#longest candidate span in words
+MAX_SPAN_WORDS = 10
+
+WORD_RE = re.compile(r"\w+")
+
+
+def fuzzy_key(title):
+    """
+    returns the standardized form of :title: without numerals the deletion neighbourhood
+    is built of (numerals are checked by the numbering rule of cmp_titles)
+    """
+    return title_key(title)[0]
+
+
+def deletions(a, max_distance):
+    """ returns the set of all strings derived from :a: by deleting up to :max_distance: characters """
+    found = {a}
+    level = {a}
+    for _ in range(max_distance):
+        level = { s[:i] + s[i+1:] for s in level for i in range(len(s)) }
+        found |= level
+    return found
+
+
+class FuzzyTitleMatcher(object):
+
+    def __init__(self, game_titles=None, title_dict=TITLE_DICT, max_distance=MAX_DISTANCE,
+                 prefix_length=PREFIX_LENGTH, min_length=MIN_FUZZY_LENGTH, min_score=MIN_SCORE, rules=ALL_RULES):
+        """
+        Matches list of :game_titles: (default: titles of JSON file :title_dict:) with up to
+        :max_distance: edits of their standardized forms (exact for forms shorter than :min_length:)
+        and a cmp_titles score of at least :min_score:
+        """
+        if game_titles is None:
+            with open(title_dict) as f:
+                game_titles = json.load(f)
+        self.titles = list(game_titles)
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.min_length = min_length
+        self.min_score = min_score
+        self.rules = rules
+
+        self.keys = [ fuzzy_key(title) for title in self.titles ]
+        self.index = {}
+        for i, key in enumerate(self.keys):
+            if key:
+                for d in deletions(key[:prefix_length], max_distance):
+                    self.index.setdefault(d, []).append(i)
+        self.max_key_length = max(map(len, self.keys), default=0)
+        self.max_words = min(MAX_SPAN_WORDS, max(( len(WORD_RE.findall(t)) for t in self.titles ), default=0))
+
+    def _allowed_distance(self, key):
+        return self.max_distance if len(key) >= self.min_length else 0
+
+    def candidates(self, key, cache=None):
+        """
+        returns the indices of all titles whose standardized form is within the allowed distance of :key:
+        (:cache: dict of prefix lookups, shared by the spans of one text)
+        """
+        prefix = key[:self.prefix_length]
+        found = None if cache is None else cache.get(prefix)
+        if found is None:
+            found = set()
+            for d in deletions(prefix, self.max_distance):
+                found.update(self.index.get(d, ()))
+            if cache is not None:
+                cache[prefix] = found
+        matches = []
+        for i in found:
+            title_key = self.keys[i]
+            allowed = self._allowed_distance(title_key)
+            if abs(len(title_key) - len(key)) <= allowed and lev.distance(title_key, key) <= allowed:
+                matches.append(i)
+        return matches
+
+    def match_span(self, span, key=None, cache=None):
+        """ returns the best matching title (:title:, :score:) of text :span:, None if no title matches """
+        if key is None:
+            key = fuzzy_key(span)
+        best = None
+        for i in self.candidates(key, cache):
+            score = cmp_titles([span], [self.titles[i]], rules=self.rules, score_cutoff=self.min_score)
+            if score >= self.min_score and score > 0 and (best is None or score > best[1]):
+                best = (self.titles[i], score)
+        return best
+
+    def __call__(self, text):
+        """
+        returns list of (title, start index, end index, score) of all titles found in :text:,
+        sorted by start index. Spans consist of whole words, end indices are inclusive;
+        of overlapping matches the longest (then the one with the best score) is kept.
+        """
+        words = [ m.span() for m in WORD_RE.finditer(text) ]
+        found = []
+        cache = {}
+        for i, (start, _) in enumerate(words):
+            for _, end in words[i:i+self.max_words]:
+                span = text[start:end]
+                key = fuzzy_key(span)
+                if len(key) > self.max_key_length + self.max_distance:
+                    break
+                match = self.match_span(span, key, cache)
+                if match is not None:
+                    found.append((match[0], start, end-1, match[1]))
+
+        found.sort(key=lambda x: (x[1]-x[2], -x[3], x[1]))
+        matches = []
+        for match in found:
+            if not any( match[1] <= kept[2] and kept[1] <= match[2] for kept in matches ):
+                matches.append(match)
+        return sorted(matches, key=lambda x: x[1])
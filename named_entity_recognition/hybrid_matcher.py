@@ -0,0 +1,91 @@
+"""
+Hybrid title matcher: the title model only runs on sentences flagged by cheap signals
+(dictionary hits, capitalized spans with numerals, title features)
+"""
+
+import re
+from title_statistics.title_feature_matchers import PATTERNS
+from .dict_matcher import TitleDictMatcher
+from .model_matcher import TitleModelMatcher, PIPE_BATCH_SIZE
+
+#title features (title_feature_matchers.PATTERNS) specific enough to flag a sentence
+SENTENCE_FEATURES = ("versus_vs", "directors_cut", "HD_remastered", "editions", "famous_patron", "number_letter")
+
+#at least two capitalized words followed by an arabic or roman numeral, e.g. "Dark Souls 2", "Final Fantasy VII".
+#Single-letter roman numerals need a title-cased word right before them ("Street Fighter V", but not "Then I went")
+_CAPITALIZED_WORD = r"[A-Z][\w'’:-]*"
+_TITLE_CASED_WORD = r"[A-Z][a-z][\w'’:-]*"
+CAPITALIZED_NUMERAL_RE = re.compile(
+    r"\b{0}(?: (?:{0}|of|the|and))* (?:{0} (?:\d+|[IVX]{{2,}})|{1} [IVX])\b".format(_CAPITALIZED_WORD, _TITLE_CASED_WORD))
+
+#sentence: up to .!? followed by whitespace or up to the end of the line
+SENTENCE_RE = re.compile(r"[^\n]+?(?:[.!?]+(?=\s)|$)", re.M)
+
+DICT_LABEL = "DICT"
+
+
+def split_sentences(text):
+    """ returns list of (start index, end index) of the sentences in :text: """
+    return [ m.span() for m in SENTENCE_RE.finditer(text) if not m.group().isspace() ]
+
+
+def merge_spans(spans):
+    """
+    merges (title, start, end, label) spans of several sources: of overlapping spans
+    the longest is kept, dictionary spans win ties. Returns spans sorted by start index.
+    """
+    ranked = sorted(spans, key=lambda x: (x[1]-x[2], x[3] != DICT_LABEL, x[1]))
+    merged = []
+    for span in ranked:
+        if not any( span[1] < kept[2] and kept[1] < span[2] for kept in merged ):
+            merged.append(span)
+    return sorted(merged, key=lambda x: x[1])
+
+
+class TitleHybridMatcher(object):
+
+    def __init__(self, dict_matcher=None, model_matcher=None, features=SENTENCE_FEATURES, patterns=PATTERNS):
+        """
+        Matches titles with :dict_matcher: (default: TitleDictMatcher) and runs :model_matcher:
+        (default: TitleModelMatcher) only on sentences with a dictionary hit,
+        a capitalized span with a numeral or one of the title :features: of :patterns:
+        """
+        self.dict_matcher = dict_matcher or TitleDictMatcher()
+        self.model_matcher = model_matcher or TitleModelMatcher()
+        self.feature_res = [ re.compile(patterns[name]["pattern"]) for name in features ]
+
+    def is_candidate(self, sentence):
+        """ True if :sentence: shows a cheap title signal besides dictionary hits """
+        if CAPITALIZED_NUMERAL_RE.search(sentence):
+            return True
+        return any( feature_re.search(sentence) for feature_re in self.feature_res )
+
+    def flagged_sentences(self, text, dict_spans=None):
+        """
+        returns list of (start index, end index) of the sentences of :text:
+        which are sent through the model
+        """
+        if dict_spans is None:
+            dict_spans = self._dict_spans(text)
+        flagged = []
+        for start, end in split_sentences(text):
+            if any( start <= s < end for _, s, _, _ in dict_spans ) or self.is_candidate(text[start:end]):
+                flagged.append((start, end))
+        return flagged
+
+    def _dict_spans(self, text):
+        #dictionary matches have inclusive end indices
+        return [ (title, start, end+1, DICT_LABEL) for title, start, end in self.dict_matcher.match(text) ]
+
+    def __call__(self, text, batch_size=PIPE_BATCH_SIZE):
+        """
+        returns list of (title, start index, end index, label) sorted by start index.
+        End indices are exclusive; dictionary matches have the label DICT and the dictionary title.
+        """
+        dict_spans = self._dict_spans(text)
+        sentences = self.flagged_sentences(text, dict_spans)
+        model_spans = [ (title, sentences[i][0]+start, sentences[i][0]+end, label)
+                        for i, title, start, end, label in self.model_matcher.pipe(
+                            (text[start:end] for start, end in sentences), batch_size=batch_size) ]
+        return merge_spans(dict_spans + model_spans)
+
@@ -1,22 +1,91 @@
-import spacy
+from functools import lru_cache
+from multiprocessing import cpu_count
 
 TEXT = "Developed by From Software, Dark Souls 2 is a sequel to the critically acclaimed Dark Souls, an action RPG with estimated sales of over 1.5 million units. The original game's appeal lay with its renowned difficulty and trial-and-error approach, one that Dark Souls 2 promises to sustain. "
 
 TITLE_MODEL = "model"
+#pipeline components not needed for entity recognition
+DISABLED_PIPES = ("tagger", "parser", "textcat")
+EXCLUDED_LABELS = ("CARDINAL",)
+#number of documents per batch in TitleModelMatcher.pipe
+PIPE_BATCH_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def load_model(model=TITLE_MODEL, disable=DISABLED_PIPES):
+    """
+    loads spacy model :model: with pipeline components :disable: disabled.
+    Every model is loaded only once per process; spacy is imported on first use.
+    """
+    import spacy
+    return spacy.load(model, disable=list(disable))
 
 
 class TitleModelMatcher(object):
 
-    nlp = spacy.load(TITLE_MODEL)
+    def __init__(self, model=TITLE_MODEL, disable=DISABLED_PIPES):
+        """
+        Matches titles with spacy model :model:, which is loaded on first use
+        """
+        self.model = model
+        self.disable = tuple(disable)
 
-    def TitleModelMatcher(self):
-        pass
+    @property
+    def nlp(self):
+        return load_model(self.model, self.disable)
+
+    def _ents(self, doc):
+        return [ (ent.text, ent.start_char, ent.end_char, ent.label_) for ent in doc.ents if ent.label_ not in EXCLUDED_LABELS ]
 
     def __call__(self, text):
-        doc = self.nlp(text)
-    
-        ents = [ (ent.text, ent.start_char, ent.end_char, ent.label_) for ent in doc.ents if ent.label_ not in ["CARDINAL"] ]
-        return ents
+        return self._ents(self.nlp(text))
+
+    def pipe(self, texts, batch_size=PIPE_BATCH_SIZE, n_process=1, as_tuples=False):
+        """
+        Runs the model on a stream of documents with nlp.pipe and yields
+        (doc id, text, start index, end index, label) in input order. The doc id is the
+        position of the document in :texts:, or the first value of each (doc id, text) tuple
+        in :texts: with :as_tuples:.
+
+        :batch_size: number of documents processed by nlp.pipe at once
+        :n_process:  number of worker processes (-1: number of CPUs), each loading the model once;
+                     at most 2 * :n_process: batches are in flight at a time.
+        """
+        #imported here, so the module still runs as a script without the package
+        from .dict_matcher import chunks, imap_ordered
+        if n_process == -1:
+            n_process = cpu_count()
+        if not as_tuples:
+            texts = enumerate(texts)
+
+        if n_process == 1:
+            for batch in chunks(texts, batch_size):
+                yield from self._match_batch(batch)
+            return
+
+        for matches in imap_ordered(_match_batch, chunks(texts, batch_size), n_process,
+                                    _init_worker, (self.model, self.disable)):
+            yield from matches
+
+    def _match_batch(self, batch):
+        """ returns list of (doc id, text, start, end, label) for all (doc id, text) in :batch: """
+        doc_ids = [ doc_id for doc_id, _ in batch ]
+        docs = self.nlp.pipe((text for _, text in batch), batch_size=len(batch))
+        return [ (doc_id,) + ent for doc_id, doc in zip(doc_ids, docs) for ent in self._ents(doc) ]
+
+
+#WORKER STATE
+_MATCHER = None
+
+
+def _init_worker(model, disable):
+    global _MATCHER
+    _MATCHER = TitleModelMatcher(model, disable)
+    _MATCHER.nlp
+
+
+def _match_batch(batch):
+    return _MATCHER._match_batch(batch)
 
 
 def test(text=TEXT):
@@ -27,4 +96,4 @@ def test(text=TEXT):
     print(titles)
 
 if __name__ == "__main__":
-    test()
\ No newline at end of file
+    test()
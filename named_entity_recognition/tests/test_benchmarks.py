@@ -0,0 +1,51 @@
+import pytest
+from click.testing import CliRunner
+from comparison_algorithm.benchmarks.corpus import generate_titles
+from ..benchmarks.documents import generate_documents, evaluate
+from ..benchmarks.matchers import run
+from ..benchmarks.__main__ import main
+
+TITLES = generate_titles(500)
+
+
+#test synthetic documents
+def test_documents_reproducible():
+    assert generate_documents(TITLES, 20, seed=1) == generate_documents(TITLES, 20, seed=1)
+    assert generate_documents(TITLES, 20, seed=1) != generate_documents(TITLES, 20, seed=2)
+
+
+def test_documents_spans():
+    documents = generate_documents(TITLES, 200, unknown_ratio=0.2)
+    mentioned = [ text[start:end] for text, spans in documents for start, end in spans ]
+    assert len(mentioned) > 100
+    known = set(TITLES)
+    assert any( title in known for title in mentioned )
+    assert any( title not in known for title in mentioned )
+
+
+def test_evaluate():
+    documents = [ ("a", [(0, 1), (2, 3)]), ("b", [(0, 4)]) ]
+    assert evaluate(documents, [ [(0, 1)], [(0, 4), (5, 6)] ]) == {"precision": 2/3, "recall": 2/3}
+    assert evaluate(documents, [ [], [] ]) == {"precision": 0.0, "recall": 0.0}
+
+
+@pytest.mark.parametrize("isolate", [False, True])
+def test_run(isolate):
+    names = ["dict (cold start)", "dict (warm start)", "dict (title store)"]
+    report = run(n_docs=20, n_titles=300, matchers=names, isolate=isolate)
+    assert report["corpus"]["docs"] == 20
+    results = [ report["results"][name] for name in names ]
+    assert all( result["chars_per_second"] > 0 for result in results )
+    assert all( result["peak_rss_mb"] > 0 for result in results )
+    assert 0 < results[0]["recall"] <= 1
+    assert len({ (result["precision"], result["recall"]) for result in results }) == 1
+
+
+def test_cli(tmpdir):
+    output = str(tmpdir.join("results.json"))
+    args = ["--docs", "10", "--titles", "200", "-m", "dict (warm start)", "--no-isolate"]
+    result = CliRunner().invoke(main, args + ["-o", output])
+    assert result.exit_code == 0, result.output
+    result = CliRunner().invoke(main, args + ["--compare", output])
+    assert result.exit_code == 0, result.output
+    assert "speedup" in result.output
@@ -0,0 +1,59 @@
+import json
+import random
+import pytest
+from click.testing import CliRunner
+from ..dict_matcher import TitleDictMatcher
+from ..corpus_matcher import match_file, match_corpus
+from ..title_store import TitleStore, build_store
+from .test_dict_matcher import GAME_TITLES
+
+FILLER = ["the", "game", "Ōkami", "über", "played", "is", "a", "(", "),", "\n", "Spyrogate", "xSpider"]
+
+
+@pytest.fixture
+def corpus(tmpdir):
+    random.seed(7)
+    words = [ random.choice(FILLER + GAME_TITLES) for _ in range(3000) ]
+    filepath = tmpdir.join("corpus.txt")
+    filepath.write_binary(" ".join(words).encode("utf-8") + b" \xff Spyro")
+    return str(filepath)
+
+
+@pytest.mark.parametrize("window_size", [7, 64, 1000])
+def test_match_file(corpus, window_size):
+    matcher = TitleDictMatcher(GAME_TITLES)
+    expected = list(match_file(corpus, matcher, window_size=1 << 30))
+    assert len(expected) > 1000
+    assert list(match_file(corpus, matcher, window_size=window_size)) == expected
+
+    with open(corpus, "rb") as f:
+        data = f.read()
+    for title, start, end in expected:
+        assert data[start:end+1].decode("utf-8").lower() == title.lower()
+    assert expected[-1] == ("Spyro", len(data)-5, len(data)-1)
+
+
+def test_match_file_with_store(corpus, tmpdir):
+    store = str(tmpdir.join("titles.store"))
+    build_store(GAME_TITLES, store)
+    expected = list(match_file(corpus, TitleDictMatcher(GAME_TITLES), window_size=64))
+    with TitleStore(store) as title_store:
+        assert list(match_file(corpus, TitleDictMatcher(store=title_store), window_size=64)) == expected
+
+
+def test_contained_titles_suppressed(tmpdir):
+    filepath = tmpdir.join("corpus.txt")
+    filepath.write("Spyro the Dragon and Spyro")
+    matches = list(match_file(str(filepath), TitleDictMatcher(GAME_TITLES)))
+    assert matches == [("Spyro the Dragon", 0, 15), ("Spyro", 21, 25)]
+
+
+def test_cli(corpus, tmpdir):
+    title_dict = tmpdir.join("titles.json")
+    title_dict.write(json.dumps(GAME_TITLES))
+    output = tmpdir.join("matches.jsonl")
+    result = CliRunner().invoke(match_corpus, [corpus, "-o", str(output), "--title-dict", str(title_dict),
+                                               "--store", str(tmpdir.join("titles.store")), "--window-size", "100"])
+    assert result.exit_code == 0, result.output
+    matches = [ json.loads(line) for line in output.readlines() ]
+    assert [ (m["title"], m["start"], m["end"]) for m in matches ] == list(match_file(corpus, TitleDictMatcher(GAME_TITLES)))
@@ -1,2 +1,109 @@
 import pytest
+import json
+import string
+from ..dict_matcher import TitleDictMatcher, TEXT
 
+GAME_TITLES = [
+    "Spyro",
+    "Spyro the Dragon",
+    "Spyro: Year of the Dragon",
+    "Spyro 2: Ripto’s Rage",
+    "Spyro Reignited Trilogy",
+    "Dragon",
+    "Spider-Man",
+    "Spider",
+    "Man",
+    "Ratchet and Clank",
+    "Insomniac",
+    "PlayStation 4",
+    "One",
+]
+
+
+def reference_matcher(game_titles, text):
+    """ former implementation of TitleDictMatcher.__call__ (str.find per title) """
+    found_titles = []
+    for title in sorted(game_titles, key=lambda x: -len(x)):
+        l_text = text.lower()
+        l_title = title.lower()
+        start_index = l_text.find(l_title)
+        while start_index >= 0:
+            prior_char = " " if start_index == 0 else l_text[start_index-1]
+            end_index = start_index+len(l_title)-1
+            after_char = " " if end_index == len(l_text)-1 else l_text[end_index+1]
+            if prior_char in string.punctuation+" " and after_char in string.punctuation+" ":
+                if not any(title in f and title != f for f in found_titles):
+                    yield(title, start_index, end_index)
+                    found_titles.append(title)
+            start_index = l_text.find(l_title, end_index+1)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        TEXT,
+        "",
+        "Spyro",
+        "spyro the dragon, SPYRO! and Spider-Man (Spider) vs. Man.",
+        "Spyros and Spidermans are no matches, One-Man is one.",
+    ]
+)
+def test_dict_matcher_same_as_reference(text):
+    matcher = TitleDictMatcher(GAME_TITLES)
+    assert list(matcher(text)) == list(reference_matcher(GAME_TITLES, text))
+
+
+def test_dict_matcher_longest_match():
+    matcher = TitleDictMatcher(GAME_TITLES)
+    titles = [ title for title, _, _ in matcher(TEXT) ]
+    assert "Spyro: Year of the Dragon" in titles
+    assert "Spyro" not in titles
+    assert "Dragon" not in titles
+
+
+#test compiled matcher file
+def test_compiled_matcher(tmpdir):
+    title_dict = tmpdir.join("game_titles.json")
+    title_dict.write(json.dumps(GAME_TITLES))
+    compiled = str(tmpdir.join("game_titles.matcher"))
+
+    matcher = TitleDictMatcher(title_dict=str(title_dict), compiled=compiled)
+    assert tmpdir.join("game_titles.matcher").exists()
+    assert list(matcher(TEXT)) == list(reference_matcher(GAME_TITLES, TEXT))
+    loaded = TitleDictMatcher(title_dict=str(title_dict), compiled=compiled)
+    assert loaded.automaton.titles == matcher.automaton.titles
+    assert sorted(loaded.game_titles) == sorted(GAME_TITLES)
+
+    #changed dictionary invalidates the compiled matcher
+    title_dict.write(json.dumps(GAME_TITLES + ["Ratchet"]))
+    changed = TitleDictMatcher(title_dict=str(title_dict), compiled=compiled)
+    assert "Ratchet" in changed.game_titles
+
+
+#test batched pipe
+@pytest.mark.parametrize("n_process", [1, 2])
+def test_pipe(n_process):
+    matcher = TitleDictMatcher(GAME_TITLES)
+    texts = [TEXT, "", "Doom and Doom II", TEXT.upper()] * 5
+    expected = [ (doc_id, title, start, end)
+                 for doc_id, text in enumerate(texts)
+                 for title, start, end in reference_matcher(GAME_TITLES, text) ]
+    assert list(matcher.pipe(texts, batch_size=3, n_process=n_process)) == expected
+
+    tuples = [ ("post-{}".format(i), text) for i, text in enumerate(texts) ]
+    assert [ m[0] for m in matcher.pipe(tuples, as_tuples=True) ] == [ "post-{}".format(m[0]) for m in expected ]
+    assert matcher.found_titles == []
+
+
+@pytest.mark.parametrize("content", [b"garbage", b"\x80\x04\x95", b"", b"\x80\x04K\x01."])
+def test_corrupt_compiled_matcher(tmpdir, content):
+    title_dict = tmpdir.join("game_titles.json")
+    title_dict.write(json.dumps(GAME_TITLES))
+    compiled = tmpdir.join("game_titles.matcher")
+    compiled.write_binary(content)
+
+    matcher = TitleDictMatcher(title_dict=str(title_dict), compiled=str(compiled))
+    assert list(matcher(TEXT)) == list(reference_matcher(GAME_TITLES, TEXT))
+    #the matcher file was recompiled
+    assert TitleDictMatcher(title_dict=str(title_dict), compiled=str(compiled)).automaton.titles == matcher.automaton.titles
+    assert compiled.read_binary() != content
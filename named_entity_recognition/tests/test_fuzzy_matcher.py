@@ -0,0 +1,49 @@
+import pytest
+from ..fuzzy_matcher import FuzzyTitleMatcher, deletions, fuzzy_key
+from .test_dict_matcher import GAME_TITLES
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return FuzzyTitleMatcher(GAME_TITLES + ["Final Fantasy VII", "Final Fantasy VIII"])
+
+
+def test_deletions():
+    assert deletions("abc", 0) == {"abc"}
+    assert deletions("abc", 1) == {"abc", "bc", "ac", "ab"}
+    assert deletions("abc", 2) == {"abc", "bc", "ac", "ab", "a", "b", "c"}
+
+
+#test single spans
+@pytest.mark.parametrize(
+    "span, expected",
+    [
+        ("Spyro Year of the Dragon", "Spyro: Year of the Dragon"),
+        ("spyro yaer of the dragon", "Spyro: Year of the Dragon"),
+        ("Ratchet and Clnak", "Ratchet and Clank"),
+        ("Insomnia", "Insomniac"),
+        ("Final Fantasy 7", "Final Fantasy VII"),
+        ("Final Fantasy 9", None),
+        ("Spira", None),
+        ("Inspiration", None),
+    ]
+)
+def test_match_span(matcher, span, expected):
+    match = matcher.match_span(span)
+    assert (match and match[0]) == expected
+
+
+def test_matcher(matcher):
+    text = "I just replayed spyro yaer of the dragon and Ratchet and Clnak on my Playstaton 4, not Final Fantasy 9."
+    matches = matcher(text)
+    assert [ (title, text[start:end+1]) for title, start, end, _ in matches ] == [
+        ("Spyro: Year of the Dragon", "spyro yaer of the dragon"),
+        ("Ratchet and Clank", "Ratchet and Clnak"),
+        ("PlayStation 4", "Playstaton 4"),
+    ]
+    assert all( 0.85 <= score <= 1 for _, _, _, score in matches )
+
+
+def test_candidates_exact_for_short_titles(matcher):
+    assert matcher.candidates(fuzzy_key("Spyro")) == [GAME_TITLES.index("Spyro")]
+    assert matcher.candidates(fuzzy_key("Spira")) == []
@@ -0,0 +1,66 @@
+import pytest
+from ..dict_matcher import TitleDictMatcher
+from ..hybrid_matcher import TitleHybridMatcher, split_sentences, merge_spans
+
+TEXT = ("Yesterday it rained all day. We played Spyro the Dragon for hours! "
+        "Then Dark Souls 2 came out. Nothing happened on Monday.\n"
+        "The Director's Cut is better. It sold 1.5 million units.")
+
+
+@pytest.fixture
+def matcher():
+    return TitleHybridMatcher(dict_matcher=TitleDictMatcher(["Spyro the Dragon"]))
+
+
+def test_split_sentences():
+    sentences = [ TEXT[start:end].strip() for start, end in split_sentences(TEXT) ]
+    assert sentences == [ "Yesterday it rained all day.",
+                          "We played Spyro the Dragon for hours!",
+                          "Then Dark Souls 2 came out.",
+                          "Nothing happened on Monday.",
+                          "The Director's Cut is better.",
+                          "It sold 1.5 million units." ]
+
+
+def test_flagged_sentences(matcher):
+    flagged = [ TEXT[start:end].strip() for start, end in matcher.flagged_sentences(TEXT) ]
+    assert flagged == [ "We played Spyro the Dragon for hours!",
+                        "Then Dark Souls 2 came out.",
+                        "The Director's Cut is better." ]
+
+
+@pytest.mark.parametrize(
+    "sentence, expected",
+    [
+        ("Then Dark Souls 2 came out.", True),
+        ("I finished Final Fantasy VII twice.", True),
+        ("Street Fighter V is out.", True),
+        ("Then I went home.", False),
+        ("Honestly I think so.", False),
+        ("In 2015 we moved.", False),
+        ("Nothing happened on Monday.", False),
+    ]
+)
+def test_is_candidate(matcher, sentence, expected):
+    assert matcher.is_candidate(sentence) == expected
+
+
+def test_merge_spans():
+    spans = [ ("Dark Souls", 5, 15, "DICT"),
+              ("Dark Souls 2", 5, 17, "GAME"),
+              ("Spyro", 30, 35, "GAME"),
+              ("Spyro", 30, 35, "DICT"),
+              ("Doom", 40, 44, "GAME") ]
+    assert merge_spans(spans) == [ ("Dark Souls 2", 5, 17, "GAME"),
+                                   ("Spyro", 30, 35, "DICT"),
+                                   ("Doom", 40, 44, "GAME") ]
+
+
+def test_hybrid_matcher(matcher):
+    pytest.importorskip("spacy")
+    import os
+    from .. import model_matcher
+    matcher.model_matcher = model_matcher.TitleModelMatcher(os.path.join(os.path.dirname(model_matcher.__file__), "model"))
+    spans = matcher(TEXT)
+    assert ("Spyro the Dragon", TEXT.index("Spyro"), TEXT.index(" for hours"), "DICT") in spans
+    assert spans == sorted(spans, key=lambda x: x[1])
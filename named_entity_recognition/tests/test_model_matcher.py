@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+import pytest
+from .. import model_matcher
+from ..model_matcher import TitleModelMatcher, TEXT
+
+MODEL = os.path.join(os.path.dirname(model_matcher.__file__), "model")
+
+
+def test_lazy_loading():
+    #fresh interpreter, so models and modules loaded by other tests don't count
+    code = ("import sys\n"
+            "from named_entity_recognition.model_matcher import TitleModelMatcher\n"
+            "TitleModelMatcher({0!r})\n"
+            "loaded = [ name for name in ('spacy', 'numpy', 'comparison_algorithm') if name in sys.modules ]\n"
+            "assert not loaded, loaded\n").format(MODEL)
+    root = os.path.dirname(os.path.dirname(model_matcher.__file__))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+    assert TitleModelMatcher(MODEL).disable == model_matcher.DISABLED_PIPES
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    pytest.importorskip("spacy")
+    return TitleModelMatcher(MODEL)
+
+
+@pytest.mark.parametrize("n_process", [1, 2])
+def test_pipe(matcher, n_process):
+    texts = [TEXT, "", TEXT[:100]] * 3
+    expected = [ (doc_id,) + ent for doc_id, text in enumerate(texts) for ent in matcher(text) ]
+    assert list(matcher.pipe(texts, batch_size=2, n_process=n_process)) == expected
+    assert all( ent[4] != "CARDINAL" for ent in expected )
@@ -0,0 +1,101 @@
+import json
+import pickle
+import pytest
+from ..dict_matcher import TitleDictMatcher, TEXT
+from ..title_store import TitleStore, build_store, load_store, is_title_store
+from .test_dict_matcher import GAME_TITLES
+
+TITLES = GAME_TITLES + ["spyro", "Ōkami", "ÄÖÜ Deluxe", ""]
+
+
+@pytest.fixture
+def store(tmpdir):
+    filepath = str(tmpdir.join("titles.store"))
+    build_store(TITLES, filepath)
+    with TitleStore(filepath) as store:
+        yield store
+
+
+def test_sequence(store):
+    assert len(store) == len(TITLES)
+    assert list(store) == TITLES
+    assert store[-1] == TITLES[-1]
+    assert store[1:3] == TITLES[1:3]
+    with pytest.raises(IndexError):
+        store[len(TITLES)]
+
+
+def test_lookup(store):
+    assert sorted( store[i] for i in store.find("SPYRO") ) == ["Spyro", "spyro"]
+    assert store.find("Spyr") == []
+    assert "Ōkami" in store
+    assert "ōkami" not in store
+    assert store.startswith("spyro ") == ["Spyro 2: Ripto’s Rage", "Spyro Reignited Trilogy", "Spyro the Dragon"]
+    assert store.startswith("äö") == ["ÄÖÜ Deluxe"]
+    assert store.startswith("xyz") == []
+    assert len(store.startswith("")) == len(TITLES)
+
+
+def test_matcher(store):
+    texts = [TEXT, TEXT.upper(), "Ōkami and spyro: year of the dragon", ""]
+    matcher = TitleDictMatcher(TITLES)
+    store_matcher = TitleDictMatcher(store=store)
+    for text in texts:
+        assert store_matcher.match(text) == matcher.match(text)
+    assert store_matcher.game_titles == matcher.game_titles
+    assert store.max_title_length == matcher.automaton.max_title_length == max(map(len, TITLES))
+    assert list(store_matcher.pipe(texts, batch_size=1, n_process=2)) == list(matcher.pipe(texts))
+
+
+def test_pickle(store):
+    loaded = pickle.loads(pickle.dumps(store))
+    assert list(loaded) == TITLES
+    loaded.close()
+
+
+def test_load_store(tmpdir):
+    title_list = tmpdir.join("titles.json")
+    title_list.write(json.dumps(TITLES))
+    filepath = str(tmpdir.join("titles.store"))
+
+    with load_store(filepath, str(title_list)) as store:
+        assert list(store) == TITLES
+        assert not store.is_stale(str(title_list))
+    assert is_title_store(filepath)
+    assert not is_title_store(str(title_list))
+
+    title_list.write(json.dumps(TITLES + ["Doom"]))
+    with load_store(filepath, str(title_list)) as store:
+        assert store[-1] == "Doom"
+
+    tmpdir.join("broken.store").write("GTTITLES")
+    with pytest.raises(ValueError):
+        TitleStore(str(tmpdir.join("broken.store")))
+
+    #another format version or a damaged file is rebuilt
+    data = bytearray(open(filepath, "rb").read())
+    data[8:10] = b"\0\0"
+    open(filepath, "wb").write(bytes(data))
+    with pytest.raises(ValueError):
+        TitleStore(filepath)
+    with load_store(filepath, str(title_list)) as store:
+        assert store[-1] == "Doom"
+    open(filepath, "wb").write(b"damaged")
+    with load_store(filepath, str(title_list)) as store:
+        assert store[-1] == "Doom"
+
+
+@pytest.mark.parametrize("end", [100, -1])
+def test_load_store_rebuilds_truncated_file(tmpdir, end):
+    title_list = tmpdir.join("titles.json")
+    title_list.write(json.dumps(TITLES))
+    filepath = str(tmpdir.join("titles.store"))
+    load_store(filepath, str(title_list)).close()
+    #cut in the offset sections or in the key blob
+    data = open(filepath, "rb").read()
+    open(filepath, "wb").write(data[:end])
+    with pytest.raises(ValueError):
+        TitleStore(filepath)
+    with load_store(filepath, str(title_list)) as store:
+        assert list(store) == TITLES
+        assert store.find(TITLES[-2]) == [len(TITLES) - 2]
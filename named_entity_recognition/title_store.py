@@ -0,0 +1,256 @@
+"""
+title_store module writes and memory-maps compact title store files.
+
+A title store holds all titles in one UTF-8 blob with an offsets array, plus the
+lowercased titles as sorted keys for binary search (exact and prefix lookup).
+Worker processes map the same file and share its pages instead of keeping
+their own lists, dicts and sets of title strings.
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from .dict_matcher import BOUNDARY_CHARS, file_checksum
+
+TITLE_STORE = "dict/game_titles.store"
+
+MAGIC = b"GTTITLES"
+FORMAT_VERSION = 2
+
+#magic, format version, number of titles, length of the longest title, sha1 checksum of the title list file
+HEADER = struct.Struct("<8sHQQ40s")
+
+#sections (name, typecode, length as function of the number of titles), stored after the header in this order
+SECTIONS = [
+    ("title_offsets", "Q", lambda n: n + 1),
+    ("key_offsets", "Q", lambda n: n + 1),
+    ("key_titles", "I", lambda n: n),
+]
+
+NO_CHECKSUM = "0" * 40
+
+
+def _align(n, to=8):
+    return (n + to - 1) // to * to
+
+
+def build_store(titles, filepath, source=None):
+    """
+    writes the title store file :filepath: for list of :titles:
+    (:source: is the title list file the titles were loaded from, its checksum is stored)
+    """
+    encoded = [ title.encode("utf-8") for title in titles ]
+    #utf-8 byte order is code point order, so keys can be compared without decoding
+    keys = sorted(( (title.lower().encode("utf-8"), i) for i, title in enumerate(titles) ))
+
+    arrays = {
+        "title_offsets": array("Q", [0]),
+        "key_offsets": array("Q", [0]),
+        "key_titles": array("I", ( i for _, i in keys )),
+    }
+    for title in encoded:
+        arrays["title_offsets"].append(arrays["title_offsets"][-1] + len(title))
+    for key, _ in keys:
+        arrays["key_offsets"].append(arrays["key_offsets"][-1] + len(key))
+
+    checksum = NO_CHECKSUM if source is None else file_checksum(source)
+    max_title_length = max(map(len, titles), default=0)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(titles), max_title_length, checksum.encode("ascii"))
+
+    tmp_filepath = "{0}.{1}.tmp".format(filepath, os.getpid())
+    with open(tmp_filepath, "wb") as f:
+        f.write(header)
+        for name, _, _ in SECTIONS:
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(arrays[name].tobytes())
+        f.write(b"".join(encoded))
+        f.write(b"".join( key for key, _ in keys ))
+    os.replace(tmp_filepath, filepath)
+
+
+def is_title_store(filepath):
+    """ checks if :filepath: is a title store file """
+    with open(filepath, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class TitleStore(Sequence):
+    """
+    Read-only, memory-mapped title store: a sequence of the titles in their original order.
+
+    The store can be used as automaton of a TitleDictMatcher (find_all, game_titles, max_title_length),
+    and is pickled by its file path, so pool workers map the file again.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            magic, version = None, None
+        else:
+            magic, version, n, max_title_length, checksum = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError("{0} is not a title store file of version {1}".format(filepath, FORMAT_VERSION))
+        self.checksum = checksum.decode("ascii")
+        self.max_title_length = max_title_length
+
+        offset = HEADER.size
+        for _, typecode, length in SECTIONS:
+            offset = _align(offset) + length(n)*array(typecode).itemsize
+        if offset > len(self._mmap):
+            self._mmap.close()
+            raise ValueError("{0} is a damaged title store file".format(filepath))
+
+        self._view = memoryview(self._mmap)
+        offset = HEADER.size
+        for name, typecode, length in SECTIONS:
+            offset = _align(offset)
+            section = self._view[offset:offset + length(n)*array(typecode).itemsize].cast(typecode)
+            setattr(self, "_" + name, section)
+            offset += section.nbytes
+        self._title_blob = offset
+        self._key_blob = offset + self._title_offsets[n]
+        self._n = n
+        #truncated files would otherwise return cut titles and keys
+        if self._key_blob + self._key_offsets[n] != len(self._mmap):
+            self.close()
+            raise ValueError("{0} is a damaged title store file".format(filepath))
+
+    def __reduce__(self):
+        return (TitleStore, (self.filepath,))
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [ self[j] for j in range(*i.indices(self._n)) ]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("title index out of range")
+        start = self._title_blob + self._title_offsets[i]
+        return self._mmap[start:self._title_blob + self._title_offsets[i+1]].decode("utf-8")
+
+    def __contains__(self, title):
+        return any( self[i] == title for i in self.find(title) )
+
+    def close(self):
+        for name, _, _ in SECTIONS:
+            self.__dict__.pop("_" + name).release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def is_stale(self, source):
+        """ checks if the store was built from a different version of title list file :source: """
+        return self.checksum != file_checksum(source)
+
+    def _key(self, j):
+        return self._mmap[self._key_blob + self._key_offsets[j]:self._key_blob + self._key_offsets[j+1]]
+
+    def _bisect_left(self, key, lo=0):
+        hi = self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _bisect_right(self, key, lo=0):
+        hi = self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key < self._key(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _lookup(self, key):
+        """
+        returns the range of sorted keys equal to utf-8 encoded :key:
+        and whether a longer key starts with :key:
+        """
+        lo = self._bisect_left(key)
+        hi = self._bisect_right(key, lo)
+        return lo, hi, hi < self._n and self._key(hi).startswith(key)
+
+    def find(self, title):
+        """ returns the indices of all titles equal to :title: ignoring case """
+        lo, hi, _ = self._lookup(title.lower().encode("utf-8"))
+        return [ self._key_titles[j] for j in range(lo, hi) ]
+
+    def prefix_range(self, prefix):
+        """ returns the range (lo, hi) of sorted keys starting with lowercased :prefix: """
+        key = prefix.lower().encode("utf-8")
+        lo = self._bisect_left(key)
+        #0xff does not occur in utf-8, so it sorts after every key starting with :key:
+        return lo, self._bisect_left(key + b"\xff", lo)
+
+    def startswith(self, prefix):
+        """ returns all titles starting with :prefix: ignoring case, sorted by their lowercased form """
+        lo, hi = self.prefix_range(prefix)
+        return [ self[self._key_titles[j]] for j in range(lo, hi) ]
+
+    def find_all(self, l_text):
+        """
+        returns all matches (rank, title, start, end) in lowercased text :l_text:
+        like TitleAutomaton.find_all; the rank orders longer titles first
+        """
+        boundaries = [ i for i, c in enumerate(l_text) if c in BOUNDARY_CHARS ]
+        ends = boundaries + [len(l_text)]
+        matches = []
+        for start in [0] + [ i+1 for i in boundaries ]:
+            #index loop instead of a list slice, which would copy the remaining ends for every start
+            for k in range(bisect_right(ends, start), len(ends)):
+                end = ends[k]
+                lo, hi, longer = self._lookup(l_text[start:end].encode("utf-8", errors="surrogateescape"))
+                for j in range(lo, hi):
+                    i = self._key_titles[j]
+                    title = self[i]
+                    matches.append(((-len(title), i), title, start, end-1))
+                if not longer:
+                    break
+        matches.sort()
+        return matches
+
+    @property
+    def game_titles(self):
+        """ all non-empty titles, longest first """
+        return sorted(( title for title in self if title ), key=lambda x: -len(x))
+
+
+def load_store(filepath=TITLE_STORE, title_list=None):
+    """
+    opens title store file :filepath:. If :title_list: (JSON list of titles) is given,
+    the store is (re)built first if it does not exist, was built from a different title list,
+    is of another format version or damaged.
+    """
+    if title_list is not None:
+        if os.path.isfile(filepath):
+            try:
+                store = TitleStore(filepath)
+            except ValueError:
+                store = None
+            if store is not None:
+                if not store.is_stale(title_list):
+                    return store
+                store.close()
+        with open(title_list) as f:
+            build_store(json.load(f), filepath, source=title_list)
+    return TitleStore(filepath)
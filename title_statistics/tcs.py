@@ -12,20 +12,24 @@ from re import escape
 from os import mkdir
 from os.path import isdir, join
 from tqdm import tqdm
-from title_feature_matchers import PATTERNS, match_feature
+from named_entity_recognition.title_store import TitleStore, is_title_store
+from title_statistics.title_feature_matchers import PATTERNS, match_feature
 
 
 OUTPATH = "saved_matches"
 OUTEXT = ".json"
 
 
-TITLE_LIST = "../named_entity_recognition/dict/game_titles.json"
+TITLE_LIST = "named_entity_recognition/dict/game_titles.json"
 
 
 def load_title_list(filepath):
     """
-    Loads a list of game titles from a json file
+    Loads a list of game titles from a json file,
+    or maps a title store file (named_entity_recognition/title_store.py)
     """
+    if is_title_store(filepath):
+        return TitleStore(filepath)
     with open(filepath) as f:
         all_titles = json.load(f)
     return all_titles